@@ -26,3 +26,12 @@ class MessageCollector(ABC):
             Source name (e.g., "slack", "gmail", "whatsapp")
         """
         pass
+    
+    def commit_cursors(self) -> None:
+        """
+        Record that the messages from the last collect() were delivered.
+        
+        Collectors that remember how far they have read override this so a
+        failed run is collected again next time. The default does nothing.
+        """
+        pass
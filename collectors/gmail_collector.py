@@ -2,17 +2,90 @@
 import logging
 import os
 import base64
+import random
+import time
 from datetime import datetime
-from typing import List, Optional
-from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import List, Optional, Tuple
+from email.utils import parseaddr, parsedate_to_datetime
 from collectors.base import MessageCollector
 from models import Message
 from utils.retry import retry_with_backoff
 
+try:
+    from google.auth.transport.requests import Request
+    from google.oauth2.credentials import Credentials
+    from google_auth_oauthlib.flow import InstalledAppFlow
+    from googleapiclient.discovery import build
+    _GOOGLE_OK = True
+except ImportError:
+    _GOOGLE_OK = False
+
+SCOPES = ['https://www.googleapis.com/auth/gmail.readonly']
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1)
+def _build_service(credentials_path: str, token_path: str):
+    """
+    Authorize and build the Gmail API service.
+    
+    The result is cached for the lifetime of the process so repeated
+    collections reuse the same credentials and service object; the
+    credentials refresh themselves when they expire.
+    """
+    if not _GOOGLE_OK:
+        logger.error("Google API libraries not installed. Install with: pip install google-auth google-auth-oauthlib google-api-python-client")
+        raise ImportError("Google API libraries not installed")
+    
+    creds = None
+    
+    # Load existing token
+    if os.path.exists(token_path):
+        creds = Credentials.from_authorized_user_file(token_path, SCOPES)
+    
+    # Refresh or get new credentials
+    if not creds or not creds.valid:
+        if creds and creds.expired and creds.refresh_token:
+            logger.info("Refreshing Gmail token")
+            creds.refresh(Request())
+        else:
+            if not os.path.exists(credentials_path):
+                logger.error(f"Gmail credentials not found at {credentials_path}")
+                raise FileNotFoundError(f"Gmail credentials not found: {credentials_path}")
+            
+            logger.info("Starting OAuth2 flow for Gmail")
+            flow = InstalledAppFlow.from_client_secrets_file(
+                credentials_path, SCOPES)
+            creds = flow.run_local_server(port=0)
+        
+        # Save credentials
+        os.makedirs(os.path.dirname(token_path), exist_ok=True)
+        with open(token_path, 'w') as token:
+            token.write(creds.to_json())
+    
+    # Use the discovery document bundled with the client library
+    # instead of fetching it over HTTP
+    return build('gmail', 'v1', credentials=creds, static_discovery=True)
+
 
 class GmailCollector(MessageCollector):
     """Collects unread emails from Gmail."""
     
+    # Gmail accepts up to 100 calls per batch, but rate limits individual
+    # parts of batches near that size, so stay well below it
+    BATCH_SIZE = 50
+    # Batch parts failing with these HTTP statuses are fetched again
+    RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+    # Attempts for each batch part, and the backoff before the first retry
+    PART_ATTEMPTS = 3
+    PART_RETRY_DELAY = 1.0
+    # Maximum number of unread emails collected per run
+    MAX_MESSAGES = 100
+    # Only these headers are used to build a Message
+    METADATA_HEADERS = ['Subject', 'From', 'Date']
+    
     def __init__(self, credentials_path: str, token_path: str):
         """
         Initialize Gmail collector.
@@ -28,45 +101,7 @@ class GmailCollector(MessageCollector):
     
     def _init_service(self):
         """Initialize Gmail API service."""
-        try:
-            from google.auth.transport.requests import Request
-            from google.oauth2.credentials import Credentials
-            from google_auth_oauthlib.flow import InstalledAppFlow
-            from googleapiclient.discovery import build
-            
-            SCOPES = ['https://www.googleapis.com/auth/gmail.readonly']
-            
-            creds = None
-            
-            # Load existing token
-            if os.path.exists(self.token_path):
-                creds = Credentials.from_authorized_user_file(self.token_path, SCOPES)
-            
-            # Refresh or get new credentials
-            if not creds or not creds.valid:
-                if creds and creds.expired and creds.refresh_token:
-                    self.logger.info("Refreshing Gmail token")
-                    creds.refresh(Request())
-                else:
-                    if not os.path.exists(self.credentials_path):
-                        self.logger.error(f"Gmail credentials not found at {self.credentials_path}")
-                        raise FileNotFoundError(f"Gmail credentials not found: {self.credentials_path}")
-                    
-                    self.logger.info("Starting OAuth2 flow for Gmail")
-                    flow = InstalledAppFlow.from_client_secrets_file(
-                        self.credentials_path, SCOPES)
-                    creds = flow.run_local_server(port=0)
-                
-                # Save credentials
-                os.makedirs(os.path.dirname(self.token_path), exist_ok=True)
-                with open(self.token_path, 'w') as token:
-                    token.write(creds.to_json())
-            
-            self.service = build('gmail', 'v1', credentials=creds)
-            
-        except ImportError:
-            self.logger.error("Google API libraries not installed. Install with: pip install google-auth google-auth-oauthlib google-api-python-client")
-            raise
+        self.service = _build_service(self.credentials_path, self.token_path)
     
     def get_source_name(self) -> str:
         """Get source name."""
@@ -74,36 +109,139 @@ class GmailCollector(MessageCollector):
     
     @retry_with_backoff(max_attempts=3, initial_delay=1.0)
     def _list_unread_messages(self) -> List[dict]:
-        """List unread messages."""
+        """List unread message IDs, following pages up to MAX_MESSAGES."""
         if not self.service:
             self._init_service()
         
-        result = self.service.users().messages().list(
-            userId='me',
-            q='is:unread in:inbox',
-            maxResults=50
-        ).execute()
+        messages = []
+        page_token = None
+        while len(messages) < self.MAX_MESSAGES:
+            result = self.service.users().messages().list(
+                userId='me',
+                q='is:unread in:inbox',
+                maxResults=self.MAX_MESSAGES - len(messages),
+                pageToken=page_token,
+                fields='messages/id,nextPageToken'
+            ).execute()
+            
+            messages.extend(result.get('messages', []))
+            page_token = result.get('nextPageToken')
+            if not page_token:
+                break
         
-        return result.get('messages', [])
+        return messages
+    
+    def _is_retryable(self, exception: Exception) -> bool:
+        """Check whether a failed batch part is worth fetching again."""
+        status = getattr(getattr(exception, 'resp', None), 'status', None)
+        if status is None:
+            return False
+        status = int(status)
+        # Gmail also reports per-user rate limits as 403 rateLimitExceeded
+        return status in self.RETRYABLE_STATUSES or (
+            status == 403 and 'ratelimitexceeded' in str(exception).lower()
+        )
     
     @retry_with_backoff(max_attempts=3, initial_delay=1.0)
-    def _get_message(self, msg_id: str) -> dict:
-        """Get full message details."""
+    def _get_message_batch(self, msg_ids: List[str]) -> Tuple[List[dict], List[str]]:
+        """
+        Get message headers for a batch of message IDs in one HTTP request.
+        
+        Returns:
+            Tuple of (fetched messages, IDs of parts that failed with a retryable error)
+        """
         if not self.service:
             self._init_service()
         
-        return self.service.users().messages().get(
-            userId='me',
-            id=msg_id,
-            format='full'
-        ).execute()
+        results = []
+        failed = []
+        
+        def on_message(request_id, response, exception):
+            if exception is None:
+                results.append(response)
+            elif self._is_retryable(exception):
+                failed.append(request_id)
+            else:
+                self.logger.error(f"Error fetching email {request_id}: {exception}")
+        
+        batch = self.service.new_batch_http_request(callback=on_message)
+        for msg_id in msg_ids:
+            batch.add(
+                self.service.users().messages().get(
+                    userId='me',
+                    id=msg_id,
+                    format='metadata',
+                    metadataHeaders=self.METADATA_HEADERS,
+                    fields='id,payload/headers'
+                ),
+                request_id=msg_id
+            )
+        batch.execute()
+        
+        return results, failed
+    
+    def _get_messages(self, msg_ids: List[str]) -> List[dict]:
+        """
+        Get message headers in batches of BATCH_SIZE.
+        
+        Parts rejected with a rate limit or server error are batched
+        together again and retried with backoff, up to PART_ATTEMPTS times.
+        """
+        messages = []
+        pending = msg_ids
+        for attempt in range(self.PART_ATTEMPTS):
+            if attempt:
+                # Full jitter, as in retry_with_backoff
+                delay = self.PART_RETRY_DELAY * 2 ** (attempt - 1)
+                self.logger.warning(f"Retrying {len(pending)} rate-limited or failed emails")
+                time.sleep(random.uniform(0, delay))
+            
+            failed = []
+            for start in range(0, len(pending), self.BATCH_SIZE):
+                fetched, batch_failed = self._get_message_batch(pending[start:start + self.BATCH_SIZE])
+                messages.extend(fetched)
+                failed.extend(batch_failed)
+            
+            pending = failed
+            if not pending:
+                break
+        
+        if pending:
+            self.logger.error(f"Failed to fetch {len(pending)} emails after {self.PART_ATTEMPTS} attempts: {pending}")
+        
+        return messages
     
-    def _extract_header(self, headers: List[dict], name: str) -> str:
-        """Extract header value by name."""
-        for header in headers:
-            if header.get('name', '').lower() == name.lower():
-                return header.get('value', '')
-        return ''
+    def _parse_message(self, msg: dict) -> Message:
+        """Build a Message from a Gmail API message resource."""
+        # Index headers by lowercase name once, then look up what we need
+        headers = {
+            header.get('name', '').lower(): header.get('value', '')
+            for header in msg.get('payload', {}).get('headers', [])
+        }
+        subject = headers.get('subject', '')
+        from_header = headers.get('from', '')
+        date_header = headers.get('date', '')
+        
+        # Parse sender
+        sender_name, sender_email = parseaddr(from_header)
+        if '@' not in sender_email:
+            # parseaddr truncates headers without an address, e.g. 'Mailer Daemon'
+            sender_email = from_header
+        
+        # Parse date
+        try:
+            timestamp = parsedate_to_datetime(date_header)
+        except Exception:
+            timestamp = datetime.now()
+        
+        return Message(
+            source="gmail",
+            sender=sender_name or sender_email,
+            sender_detail=sender_email,
+            content=subject or "(No Subject)",
+            timestamp=timestamp,
+            message_type="email"
+        )
     
     def collect(self) -> List[Message]:
         """Collect unread emails from Gmail."""
@@ -116,43 +254,14 @@ class GmailCollector(MessageCollector):
             message_list = self._list_unread_messages()
             self.logger.info(f"Found {len(message_list)} unread emails")
             
-            for msg_ref in message_list:
+            # Fetch headers for all messages in batched requests
+            raw_messages = self._get_messages([msg_ref['id'] for msg_ref in message_list])
+            
+            for msg in raw_messages:
                 try:
-                    # Get full message
-                    msg = self._get_message(msg_ref['id'])
-                    
-                    # Extract headers
-                    headers = msg.get('payload', {}).get('headers', [])
-                    subject = self._extract_header(headers, 'Subject')
-                    from_header = self._extract_header(headers, 'From')
-                    date_header = self._extract_header(headers, 'Date')
-                    
-                    # Parse sender
-                    sender_name = from_header
-                    sender_email = from_header
-                    if '<' in from_header and '>' in from_header:
-                        sender_name = from_header.split('<')[0].strip().strip('"')
-                        sender_email = from_header.split('<')[1].split('>')[0].strip()
-                    
-                    # Parse date
-                    try:
-                        timestamp = parsedate_to_datetime(date_header)
-                    except Exception:
-                        timestamp = datetime.now()
-                    
-                    # Create message object
-                    message = Message(
-                        source="gmail",
-                        sender=sender_name or sender_email,
-                        sender_detail=sender_email,
-                        content=subject or "(No Subject)",
-                        timestamp=timestamp,
-                        message_type="email"
-                    )
-                    messages.append(message)
-                
+                    messages.append(self._parse_message(msg))
                 except Exception as e:
-                    self.logger.error(f"Error processing email {msg_ref.get('id')}: {e}")
+                    self.logger.error(f"Error processing email {msg.get('id')}: {e}")
                     continue
             
             self.logger.info(f"Collected {len(messages)} emails from Gmail")
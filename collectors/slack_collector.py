@@ -1,37 +1,122 @@
 """Slack message collector."""
+import json
 import logging
+import os
+import tempfile
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 from collectors.base import MessageCollector
 from models import Message
 from utils.retry import retry_with_backoff
 
+try:
+    from slack_sdk import WebClient
+    from slack_sdk.errors import SlackApiError
+    from slack_sdk.http_retry.builtin_handlers import RateLimitErrorRetryHandler
+    _SLACK_OK = True
+except ImportError:
+    _SLACK_OK = False
+
 
 class SlackCollector(MessageCollector):
     """Collects unread messages from Slack."""
     
-    def __init__(self, token: str):
+    # Default maximum number of Slack API calls in flight at once; history
+    # and user lookups are rate limited per workspace, so keep this small
+    MAX_WORKERS = 4
+    # Times a rate-limited call is retried after waiting out Retry-After
+    RATE_LIMIT_RETRIES = 3
+    # Per-request timeout in seconds, the same as WebClient's default
+    # but stated here so it is visible next to the pool size
+    REQUEST_TIMEOUT = 30
+    # Messages requested per conversations.history page, Slack's recommended maximum
+    HISTORY_PAGE_SIZE = 200
+    # How far back to read channels that have no saved cursor yet
+    DEFAULT_LOOKBACK_SECONDS = 24 * 60 * 60
+    
+    def __init__(
+        self,
+        token: str,
+        cursor_path: str = 'state/slack_cursors.json',
+        max_workers: int = MAX_WORKERS
+    ):
         """
         Initialize Slack collector.
         
         Args:
             token: Slack bot token
+            cursor_path: Path to store/load the latest message timestamp per channel
+            max_workers: Maximum number of Slack API calls in flight at once
         """
         self.token = token
+        self.cursor_path = cursor_path
+        self.max_workers = max_workers
         self.logger = logging.getLogger(__name__)
         self.client = None
+        self.cursors: Dict[str, str] = {}
+        # Cursors advanced by the last collect(), applied by commit_cursors()
+        self._pending_cursors: Dict[str, str] = {}
+        self._user_cache: Dict[str, dict] = {}
     
     def _init_client(self):
         """Initialize Slack client."""
-        try:
-            from slack_sdk import WebClient
-            from slack_sdk.errors import SlackApiError
-            self.client = WebClient(token=self.token)
-            self.SlackApiError = SlackApiError
-        except ImportError:
+        if not _SLACK_OK:
             self.logger.error("slack_sdk not installed. Install with: pip install slack-sdk")
+            raise ImportError("slack_sdk not installed")
+        
+        self.client = WebClient(token=self.token, timeout=self.REQUEST_TIMEOUT)
+        # Wait as long as Slack's Retry-After asks on HTTP 429 instead of
+        # failing fast into retry_with_backoff's short delays
+        self.client.retry_handlers.append(RateLimitErrorRetryHandler(max_retry_count=self.RATE_LIMIT_RETRIES))
+        self.SlackApiError = SlackApiError
+        self.cursors = self._load_cursors()
+    
+    def _load_cursors(self) -> Dict[str, str]:
+        """Load saved per-channel cursors, or an empty mapping if unavailable."""
+        if not os.path.exists(self.cursor_path):
+            return {}
+        
+        try:
+            with open(self.cursor_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Failed to load Slack cursors from {self.cursor_path}: {e}")
+            return {}
+    
+    def _save_cursors(self):
+        """Atomically write per-channel cursors to disk."""
+        cursor_dir = os.path.dirname(self.cursor_path) or '.'
+        os.makedirs(cursor_dir, exist_ok=True)
+        
+        fd, tmp_path = tempfile.mkstemp(dir=cursor_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(self.cursors, f)
+            os.replace(tmp_path, self.cursor_path)
+        except Exception:
+            os.remove(tmp_path)
             raise
     
+    def commit_cursors(self) -> None:
+        """
+        Advance and save the channel cursors from the last collect().
+        
+        Call this only after the collected messages have been delivered;
+        until then the next run reads the same messages again.
+        """
+        if not self._pending_cursors:
+            return
+        
+        self.cursors.update(self._pending_cursors)
+        self._pending_cursors = {}
+        
+        try:
+            self._save_cursors()
+        except OSError as e:
+            self.logger.warning(f"Failed to save Slack cursors to {self.cursor_path}: {e}")
+    
     def get_source_name(self) -> str:
         """Get source name."""
         return "slack"
@@ -49,29 +134,75 @@ class SlackCollector(MessageCollector):
         return result.get("channels", [])
     
     @retry_with_backoff(max_attempts=3, initial_delay=1.0)
-    def _get_conversation_history(self, channel_id: str, oldest: Optional[str] = None) -> List[dict]:
-        """Get conversation history."""
+    def _get_history_page(self, channel_id: str, oldest: Optional[str], cursor: Optional[str] = None) -> dict:
+        """Get one page of conversation history."""
         if not self.client:
             self._init_client()
         
-        result = self.client.conversations_history(
+        return self.client.conversations_history(
             channel=channel_id,
-            oldest=oldest or "0"
+            oldest=oldest or "0",
+            limit=self.HISTORY_PAGE_SIZE,
+            cursor=cursor
         )
-        return result.get("messages", [])
+    
+    def _get_conversation_history(self, channel_id: str, oldest: Optional[str] = None) -> List[dict]:
+        """
+        Get all conversation history newer than oldest.
+        
+        Pages are followed until Slack reports no more, so the channel
+        cursor never moves past messages beyond the first page.
+        """
+        messages = []
+        cursor = None
+        while True:
+            result = self._get_history_page(channel_id, oldest, cursor)
+            messages.extend(result.get("messages", []))
+            
+            cursor = (result.get("response_metadata") or {}).get("next_cursor")
+            if not result.get("has_more") or not cursor:
+                return messages
     
     @retry_with_backoff(max_attempts=3, initial_delay=1.0)
     def _get_user_info(self, user_id: str) -> dict:
-        """Get user information."""
+        """Get user information, served from cache for repeat user IDs."""
+        if user_id in self._user_cache:
+            return self._user_cache[user_id]
+        
         if not self.client:
             self._init_client()
         
         result = self.client.users_info(user=user_id)
-        return result.get("user", {})
+        user_info = result.get("user", {})
+        self._user_cache[user_id] = user_info
+        return user_info
+    
+    def _fetch_history(self, conv: dict, oldest: str) -> List[dict]:
+        """Get conversation history, logging and skipping failed channels."""
+        try:
+            return self._get_conversation_history(conv.get("id"), oldest)
+        except Exception as e:
+            self.logger.error(f"Error processing channel {conv.get('name', 'Direct Message')}: {e}")
+            return []
+    
+    def _get_sender_name(self, user_id: str) -> str:
+        """Resolve a user ID to a display name, falling back to "Unknown"."""
+        try:
+            user_info = self._get_user_info(user_id)
+            return user_info.get("real_name") or user_info.get("name", "Unknown")
+        except Exception as e:
+            self.logger.warning(f"Failed to get user info for {user_id}: {e}")
+            return "Unknown"
+    
+    @staticmethod
+    def _is_user_message(msg: dict) -> bool:
+        """Check whether a history entry is a user-authored text message."""
+        return not msg.get("bot_id") and bool(msg.get("text")) and bool(msg.get("user"))
     
     def collect(self) -> List[Message]:
         """Collect unread messages from Slack."""
         messages = []
+        self._pending_cursors = {}
         
         try:
             self.logger.info("Starting Slack message collection")
@@ -80,51 +211,58 @@ class SlackCollector(MessageCollector):
             conversations = self._get_conversations()
             self.logger.info(f"Found {len(conversations)} Slack conversations")
             
-            for conv in conversations:
-                channel_id = conv.get("id")
+            # Only read messages newer than the last run, or the default lookback
+            default_oldest = str(time.time() - self.DEFAULT_LOOKBACK_SECONDS)
+            oldest = [self.cursors.get(conv.get("id"), default_oldest) for conv in conversations]
+            
+            # Fetch history for every channel through one bounded pool, and
+            # queue each new sender lookup as soon as its channel arrives so
+            # user lookups overlap the remaining history fetches
+            histories: List[List[dict]] = [[] for _ in conversations]
+            sender_futures: Dict[str, Future] = {}
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                history_futures = {
+                    executor.submit(self._fetch_history, conv, conv_oldest): index
+                    for index, (conv, conv_oldest) in enumerate(zip(conversations, oldest))
+                }
+                for future in as_completed(history_futures):
+                    history = future.result()
+                    histories[history_futures[future]] = history
+                    for msg in history:
+                        if self._is_user_message(msg) and msg["user"] not in sender_futures:
+                            sender_futures[msg["user"]] = executor.submit(self._get_sender_name, msg["user"])
+            
+            sender_names = {user_id: future.result() for user_id, future in sender_futures.items()}
+            
+            for conv, history in zip(conversations, histories):
                 channel_name = conv.get("name", "Direct Message")
                 is_im = conv.get("is_im", False)
                 
-                try:
-                    # Get recent messages (last 24 hours worth)
-                    history = self._get_conversation_history(channel_id)
+                for msg in history:
+                    # Skip bot messages and messages without text or author
+                    if not self._is_user_message(msg):
+                        continue
                     
-                    for msg in history:
-                        # Skip bot messages and messages without text
-                        if msg.get("bot_id") or not msg.get("text"):
-                            continue
-                        
-                        user_id = msg.get("user")
-                        if not user_id:
-                            continue
-                        
-                        # Get user info
-                        try:
-                            user_info = self._get_user_info(user_id)
-                            sender_name = user_info.get("real_name") or user_info.get("name", "Unknown")
-                        except Exception as e:
-                            self.logger.warning(f"Failed to get user info for {user_id}: {e}")
-                            sender_name = "Unknown"
-                        
-                        # Create message object
-                        message = Message(
-                            source="slack",
-                            sender=sender_name,
-                            sender_detail=f"#{channel_name}" if not is_im else "Direct Message",
-                            content=msg.get("text", ""),
-                            timestamp=datetime.fromtimestamp(float(msg.get("ts", 0))),
-                            message_type="direct" if is_im else "channel"
-                        )
-                        messages.append(message)
+                    # Create message object
+                    message = Message(
+                        source="slack",
+                        sender=sender_names[msg["user"]],
+                        sender_detail=f"#{channel_name}" if not is_im else "Direct Message",
+                        content=msg.get("text", ""),
+                        timestamp=datetime.fromtimestamp(float(msg.get("ts", 0))),
+                        message_type="direct" if is_im else "channel"
+                    )
+                    messages.append(message)
                 
-                except Exception as e:
-                    self.logger.error(f"Error processing channel {channel_name}: {e}")
-                    continue
+                # Remember the newest message seen; saved once the digest is delivered
+                if history:
+                    self._pending_cursors[conv.get("id")] = max((msg.get("ts", "0") for msg in history), key=float)
             
             self.logger.info(f"Collected {len(messages)} messages from Slack")
             
         except Exception as e:
             self.logger.error(f"Slack collection failed: {e}")
+            self._pending_cursors = {}
             return []
         
         return messages
@@ -1,6 +1,7 @@
 """Configuration management for Daily Digest Maker."""
 import os
-from typing import Optional
+from functools import cached_property
+from typing import Dict, Optional
 from models import SMTPConfig, AppConfig
 
 
@@ -10,75 +11,101 @@ class Config:
     def __init__(self, config_file: Optional[str] = None):
         """Initialize configuration."""
         self.config_file = config_file
-        self._load_env_file()
+        self._env = self._load_env_file()
     
-    def _load_env_file(self):
-        """Load environment variables from .env file if it exists."""
+    def _load_env_file(self) -> Dict[str, str]:
+        """
+        Load variables from .env file if it exists, merged with the process environment.
+        
+        Process environment variables take precedence over the file, and
+        os.environ itself is left untouched.
+        """
+        env = {}
         if self.config_file and os.path.exists(self.config_file):
             try:
-                from dotenv import load_dotenv
-                load_dotenv(self.config_file)
+                from dotenv import dotenv_values
+                env.update(
+                    (key, value)
+                    for key, value in dotenv_values(self.config_file).items()
+                    if value is not None
+                )
             except ImportError:
                 pass  # python-dotenv not installed
+        env.update(os.environ)
+        return env
     
     def get_slack_token(self) -> Optional[str]:
         """Get Slack bot token."""
-        return os.getenv('SLACK_BOT_TOKEN')
+        return self._env.get('SLACK_BOT_TOKEN')
     
     def get_gmail_credentials_path(self) -> Optional[str]:
         """Get path to Gmail credentials file."""
-        return os.getenv('GMAIL_CREDENTIALS_PATH', 'credentials/gmail_credentials.json')
+        return self._env.get('GMAIL_CREDENTIALS_PATH', 'credentials/gmail_credentials.json')
     
     def get_gmail_token_path(self) -> str:
         """Get path to Gmail token file."""
-        return os.getenv('GMAIL_TOKEN_PATH', 'credentials/gmail_token.json')
+        return self._env.get('GMAIL_TOKEN_PATH', 'credentials/gmail_token.json')
     
     def get_smtp_settings(self) -> SMTPConfig:
         """Get SMTP configuration."""
         return SMTPConfig(
-            host=os.getenv('SMTP_HOST', 'smtp.gmail.com'),
-            port=int(os.getenv('SMTP_PORT', '587')),
-            username=os.getenv('SMTP_USERNAME', ''),
-            password=os.getenv('SMTP_PASSWORD', ''),
-            use_tls=os.getenv('SMTP_USE_TLS', 'true').lower() == 'true'
+            host=self._env.get('SMTP_HOST', 'smtp.gmail.com'),
+            port=int(self._env.get('SMTP_PORT', '587')),
+            username=self._env.get('SMTP_USERNAME', ''),
+            password=self._env.get('SMTP_PASSWORD', ''),
+            use_tls=self._env.get('SMTP_USE_TLS', 'true').lower() == 'true'
         )
     
     def get_recipient_email(self) -> str:
         """Get recipient email address."""
-        return os.getenv('RECIPIENT_EMAIL', '')
+        return self._env.get('RECIPIENT_EMAIL', '')
     
     def get_schedule_time(self) -> str:
         """Get scheduled execution time."""
-        return os.getenv('SCHEDULE_TIME', '20:00')
+        return self._env.get('SCHEDULE_TIME', '20:00')
     
     def get_log_level(self) -> str:
         """Get logging level."""
-        return os.getenv('LOG_LEVEL', 'INFO')
+        return self._env.get('LOG_LEVEL', 'INFO')
     
     def get_enable_whatsapp_placeholder(self) -> bool:
         """Get whether to enable WhatsApp placeholder messages."""
-        return os.getenv('ENABLE_WHATSAPP_PLACEHOLDER', 'false').lower() == 'true'
+        return self._env.get('ENABLE_WHATSAPP_PLACEHOLDER', 'false').lower() == 'true'
+    
+    def get_send_empty_digest(self) -> bool:
+        """Get whether to send the digest on days with no notifications."""
+        return self._env.get('SEND_EMPTY_DIGEST', 'false').lower() == 'true'
     
     def validate(self) -> bool:
         """Validate that required configuration is present."""
         errors = []
         
-        smtp = self.get_smtp_settings()
-        if not smtp.username:
-            errors.append("SMTP_USERNAME is required")
-        if not smtp.password:
-            errors.append("SMTP_PASSWORD is required")
-        
-        if not self.get_recipient_email():
-            errors.append("RECIPIENT_EMAIL is required")
+        try:
+            app_config = self._app_config
+        except ValueError:
+            errors.append(f"SMTP_PORT must be a number, got {self._env['SMTP_PORT']!r}")
+        else:
+            if not app_config.smtp.username:
+                errors.append("SMTP_USERNAME is required")
+            if not app_config.smtp.password:
+                errors.append("SMTP_PASSWORD is required")
+            
+            if not app_config.recipient_email:
+                errors.append("RECIPIENT_EMAIL is required")
         
         if errors:
             raise ValueError(f"Configuration validation failed: {', '.join(errors)}")
         
         return True
     
-    def get_app_config(self) -> AppConfig:
-        """Get complete application configuration."""
+    @cached_property
+    def _app_config(self) -> AppConfig:
+        """
+        Application configuration built from the environment loaded at construction.
+        
+        Built on first use, so malformed values are reported by validate()
+        rather than raised from the constructor.
+        """
         return AppConfig(
             slack_token=self.get_slack_token(),
             gmail_credentials_path=self.get_gmail_credentials_path(),
@@ -86,5 +113,10 @@ class Config:
             smtp=self.get_smtp_settings(),
             recipient_email=self.get_recipient_email(),
             schedule_time=self.get_schedule_time(),
-            log_level=self.get_log_level()
+            log_level=self.get_log_level(),
+            send_empty_digest=self.get_send_empty_digest()
         )
+    
+    def get_app_config(self) -> AppConfig:
+        """Get complete application configuration, as loaded at construction."""
+        return self._app_config
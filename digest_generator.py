@@ -1,81 +1,31 @@
 """Digest generator for formatting collected messages."""
+import io
 import logging
+import string
+from collections import defaultdict
 from datetime import datetime
-from typing import List, Dict, Tuple
+from functools import lru_cache
+from operator import attrgetter
+from typing import List, Dict, TextIO, Tuple
 from models import Message
 import html
 
 
-class DigestGenerator:
-    """Generates formatted digests from collected messages."""
-    
-    def __init__(self):
-        """Initialize digest generator."""
-        self.logger = logging.getLogger(__name__)
-    
-    def _group_by_source(self, messages: List[Message]) -> Dict[str, List[Message]]:
-        """Group messages by source platform."""
-        grouped = {}
-        for message in messages:
-            if message.source not in grouped:
-                grouped[message.source] = []
-            grouped[message.source].append(message)
-        return grouped
-    
-    def _sort_by_timestamp(self, messages: List[Message]) -> List[Message]:
-        """Sort messages by timestamp in descending order."""
-        return sorted(messages, key=lambda m: m.timestamp, reverse=True)
-    
-    def _format_timestamp(self, timestamp: datetime) -> str:
-        """Format timestamp in human-readable format."""
-        return timestamp.strftime("%B %d, %Y at %I:%M %p")
-    
-    def _generate_plain_text(self, grouped_messages: Dict[str, List[Message]]) -> str:
-        """Generate plain text version of digest."""
-        lines = []
-        
-        # Header
-        today = datetime.now().strftime("%B %d, %Y")
-        total_count = sum(len(msgs) for msgs in grouped_messages.values())
-        
-        lines.append(f"Daily Digest - {today}")
-        lines.append(f"Total Notifications: {total_count}")
-        lines.append("")
-        
-        if total_count == 0:
-            lines.append("No new notifications found.")
-            return "\n".join(lines)
-        
-        # Group by source
-        source_order = ["slack", "gmail", "whatsapp"]
-        for source in source_order:
-            if source not in grouped_messages:
-                continue
-            
-            messages = self._sort_by_timestamp(grouped_messages[source])
-            source_name = source.upper()
-            
-            lines.append(f"=== {source_name} ({len(messages)} messages) ===")
-            lines.append("")
-            
-            for msg in messages:
-                lines.append(f"• {msg.sender_detail} - {msg.sender} ({self._format_timestamp(msg.timestamp)})")
-                lines.append(f"  {msg.content}")
-                lines.append("")
-            
-            lines.append("")
-        
-        return "\n".join(lines)
-    
-    def _generate_html(self, grouped_messages: Dict[str, List[Message]]) -> str:
-        """Generate HTML version of digest."""
-        today = datetime.now().strftime("%B %d, %Y")
-        total_count = sum(len(msgs) for msgs in grouped_messages.values())
-        
-        html_parts = []
-        
-        # HTML header with styling
-        html_parts.append("""
+# Sort key for ordering messages by time
+_TS_KEY = attrgetter('timestamp')
+
+# Markup for a single message entry in the HTML digest
+_MESSAGE_HTML = string.Template(
+    '<div class="message">'
+    '<div class="message-sender">$sender</div>'
+    '<div class="message-detail">$detail</div>'
+    '<div class="message-content">$content</div>'
+    '<div class="message-time">$time</div>'
+    '</div>'
+)
+
+# Document head, styles and opening container markup for the HTML digest
+_HTML_HEADER = """
 <!DOCTYPE html>
 <html>
 <head>
@@ -157,14 +107,102 @@ class DigestGenerator:
 </head>
 <body>
     <div class="container">
-""")
+"""
+
+# Closing markup for the HTML digest
+_HTML_FOOTER = """
+    </div>
+</body>
+</html>
+"""
+
+
+def _esc(text: str) -> str:
+    """HTML-escape text, returning it unchanged when it has nothing to escape."""
+    # Most fields are plain text; the membership checks are much cheaper
+    # than html.escape's five replace passes
+    if '&' in text or '<' in text or '>' in text or '"' in text or "'" in text:
+        return html.escape(text)
+    return text
+
+
+@lru_cache(maxsize=4096)
+def _format_wall_minute(wall_minute: datetime) -> str:
+    """Format a naive, minute-truncated timestamp for display."""
+    return wall_minute.strftime("%B %d, %Y at %I:%M %p")
+
+
+class DigestGenerator:
+    """Generates formatted digests from collected messages."""
+    
+    def __init__(self):
+        """Initialize digest generator."""
+        self.logger = logging.getLogger(__name__)
+    
+    def _group_by_source(self, messages: List[Message]) -> Dict[str, List[Message]]:
+        """Group messages by source platform."""
+        grouped = defaultdict(list)
+        for message in messages:
+            grouped[message.source].append(message)
+        return dict(grouped)
+    
+    def _sort_by_timestamp(self, messages: List[Message]) -> List[Message]:
+        """Sort messages by timestamp in descending order."""
+        return sorted(messages, key=_TS_KEY, reverse=True)
+    
+    def _format_timestamp(self, timestamp: datetime) -> str:
+        """Format timestamp in human-readable format."""
+        # Aware datetimes in different zones can compare equal while showing
+        # different wall-clock times, so cache on the naive wall-clock minute.
+        return _format_wall_minute(timestamp.replace(tzinfo=None, second=0, microsecond=0))
+    
+    def _emit_plain(self, writer: TextIO, grouped_messages: Dict[str, List[Message]]) -> None:
+        """Write plain text version of digest from pre-sorted groups."""
+        # Header
+        today = datetime.now().strftime("%B %d, %Y")
+        total_count = sum(len(msgs) for msgs in grouped_messages.values())
+        
+        writer.write(f"Daily Digest - {today}\n")
+        writer.write(f"Total Notifications: {total_count}\n")
+        writer.write("\n")
+        
+        if total_count == 0:
+            writer.write("No new notifications found.\n")
+            return
+        
+        # Group by source
+        source_order = ["slack", "gmail", "whatsapp"]
+        for source in source_order:
+            if source not in grouped_messages:
+                continue
+            
+            messages = grouped_messages[source]
+            source_name = source.upper()
+            
+            writer.write(f"=== {source_name} ({len(messages)} messages) ===\n")
+            writer.write("\n")
+            
+            for msg in messages:
+                writer.write(f"• {msg.sender_detail} - {msg.sender} ({self._format_timestamp(msg.timestamp)})\n")
+                writer.write(f"  {msg.content}\n")
+                writer.write("\n")
+            
+            writer.write("\n")
+    
+    def _emit_html(self, writer: TextIO, grouped_messages: Dict[str, List[Message]]) -> None:
+        """Write HTML version of digest from pre-sorted groups."""
+        today = datetime.now().strftime("%B %d, %Y")
+        total_count = sum(len(msgs) for msgs in grouped_messages.values())
+        
+        # HTML header with styling
+        writer.write(_HTML_HEADER)
         
         # Title and summary
-        html_parts.append(f"<h1>Daily Digest - {html.escape(today)}</h1>")
-        html_parts.append(f'<div class="summary">Total Notifications: <strong>{total_count}</strong></div>')
+        writer.write(f"<h1>Daily Digest - {_esc(today)}</h1>")
+        writer.write(f'<div class="summary">Total Notifications: <strong>{total_count}</strong></div>')
         
         if total_count == 0:
-            html_parts.append('<div class="no-messages">No new notifications found.</div>')
+            writer.write('<div class="no-messages">No new notifications found.</div>')
         else:
             # Group by source
             source_order = ["slack", "gmail", "whatsapp"]
@@ -172,30 +210,43 @@ class DigestGenerator:
                 if source not in grouped_messages:
                     continue
                 
-                messages = self._sort_by_timestamp(grouped_messages[source])
+                messages = grouped_messages[source]
                 source_name = source.upper()
                 
-                html_parts.append(f'<div class="source-section">')
-                html_parts.append(f'<div class="source-header {source}">{html.escape(source_name)} ({len(messages)} messages)</div>')
+                writer.write(f'<div class="source-section">')
+                writer.write(f'<div class="source-header {source}">{_esc(source_name)} ({len(messages)} messages)</div>')
                 
                 for msg in messages:
-                    html_parts.append('<div class="message">')
-                    html_parts.append(f'<div class="message-sender">{html.escape(msg.sender)}</div>')
-                    html_parts.append(f'<div class="message-detail">{html.escape(msg.sender_detail)}</div>')
-                    html_parts.append(f'<div class="message-content">{html.escape(msg.content)}</div>')
-                    html_parts.append(f'<div class="message-time">{html.escape(self._format_timestamp(msg.timestamp))}</div>')
-                    html_parts.append('</div>')
+                    writer.write(_MESSAGE_HTML.substitute(
+                        sender=_esc(msg.sender),
+                        detail=_esc(msg.sender_detail),
+                        content=_esc(msg.content),
+                        time=_esc(self._format_timestamp(msg.timestamp))
+                    ))
                 
-                html_parts.append('</div>')
+                writer.write('</div>')
         
         # HTML footer
-        html_parts.append("""
-    </div>
-</body>
-</html>
-""")
-        
-        return "".join(html_parts)
+        writer.write(_HTML_FOOTER)
+    
+    def _generate_plain_text(self, grouped_messages: Dict[str, List[Message]]) -> str:
+        """Generate plain text version of digest from pre-sorted groups."""
+        buf = io.StringIO()
+        self._emit_plain(buf, grouped_messages)
+        return buf.getvalue()
+    
+    def _generate_html(self, grouped_messages: Dict[str, List[Message]]) -> str:
+        """Generate HTML version of digest from pre-sorted groups."""
+        buf = io.StringIO()
+        self._emit_html(buf, grouped_messages)
+        return buf.getvalue()
+    
+    def _group_and_sort(self, messages: List[Message]) -> Dict[str, List[Message]]:
+        """Group messages by source and sort each group newest first."""
+        return {
+            source: self._sort_by_timestamp(source_messages)
+            for source, source_messages in self._group_by_source(messages).items()
+        }
     
     def generate(self, messages: List[Message]) -> Tuple[str, str]:
         """
@@ -209,8 +260,8 @@ class DigestGenerator:
         """
         self.logger.info(f"Generating digest for {len(messages)} messages")
         
-        # Group and sort messages
-        grouped = self._group_by_source(messages)
+        # Group and sort messages once for both formats
+        grouped = self._group_and_sort(messages)
         
         # Generate both formats
         plain_text = self._generate_plain_text(grouped)
@@ -219,3 +270,23 @@ class DigestGenerator:
         self.logger.info("Digest generation complete")
         
         return plain_text, html_content
+    
+    def generate_to(self, messages: List[Message], text_writer: TextIO, html_writer: TextIO) -> None:
+        """
+        Write plain text and HTML digests directly to file-like objects.
+        
+        Avoids materializing the full digests as strings, which is useful
+        for very large digests written to files or sockets.
+        
+        Args:
+            messages: List of messages to include in digest
+            text_writer: Writable text stream for the plain text digest
+            html_writer: Writable text stream for the HTML digest
+        """
+        self.logger.info(f"Generating digest for {len(messages)} messages")
+        
+        grouped = self._group_and_sort(messages)
+        self._emit_plain(text_writer, grouped)
+        self._emit_html(html_writer, grouped)
+        
+        self.logger.info("Digest generation complete")
@@ -1,28 +1,134 @@
 """Email sender for delivering digests."""
+import html
+import io
 import logging
 import smtplib
+import string
+from email.generator import BytesGenerator
+from email.message import Message
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from email.utils import getaddresses, parseaddr
 from datetime import datetime
 from typing import Optional
+from config import Config
 from models import SMTPConfig
 from utils.retry import retry_with_backoff
 
 
+# HTML body of the error notification email
+_ERROR_HTML = string.Template("""
+<!DOCTYPE html>
+<html>
+<head>
+    <style>
+        body { font-family: Arial, sans-serif; padding: 20px; }
+        .error-box { 
+            background-color: #fee; 
+            border: 2px solid #c00; 
+            padding: 20px; 
+            border-radius: 5px; 
+        }
+        h1 { color: #c00; }
+    </style>
+</head>
+<body>
+    <div class="error-box">
+        <h1>Daily Digest Maker Error</h1>
+        <p>An error occurred while generating your daily digest:</p>
+        <pre>$error_message</pre>
+        <p>Please check the logs for more details.</p>
+        <p><small>Time: $time</small></p>
+    </div>
+</body>
+</html>
+""")
+
+
 class EmailSender:
     """Sends digest emails via SMTP."""
     
-    def __init__(self, smtp_config: SMTPConfig, recipient_email: str):
+    def __init__(self, smtp_config: SMTPConfig, recipient_email: str, send_empty: bool = False):
         """
         Initialize email sender.
         
         Args:
             smtp_config: SMTP configuration
             recipient_email: Recipient email address
+            send_empty: Whether to send the digest when it has no messages
         """
         self.smtp_config = smtp_config
         self.recipient_email = recipient_email
+        self.send_empty = send_empty
         self.logger = logging.getLogger(__name__)
+        self._server: Optional[smtplib.SMTP] = None
+        self._in_session = False
+        self._pipelining = False
+    
+    @classmethod
+    def from_env(cls, config_file: Optional[str] = '.env') -> 'EmailSender':
+        """
+        Create an email sender from the environment and optional .env file.
+        
+        Args:
+            config_file: Path to the .env file to load
+        
+        Returns:
+            EmailSender configured for the SMTP settings and recipient
+        """
+        app_config = Config(config_file).get_app_config()
+        return cls(app_config.smtp, app_config.recipient_email, app_config.send_empty_digest)
+    
+    def __enter__(self) -> 'EmailSender':
+        """
+        Start an SMTP session shared by all sends until exit.
+        
+        The connection is opened lazily on the first send and closed on exit.
+        Outside a session, each send uses its own connection.
+        """
+        self._in_session = True
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """End the SMTP session and close the connection."""
+        self._in_session = False
+        self.close()
+    
+    def _connect(self) -> smtplib.SMTP:
+        """
+        Open and authenticate a new SMTP connection.
+        
+        login() performs the final EHLO, so the server's extensions are
+        recorded here once and reused by every send on this connection.
+        """
+        if self.smtp_config.use_tls:
+            server = smtplib.SMTP(self.smtp_config.host, self.smtp_config.port)
+        else:
+            server = smtplib.SMTP_SSL(self.smtp_config.host, self.smtp_config.port)
+        
+        try:
+            if self.smtp_config.use_tls:
+                server.starttls()
+            server.login(self.smtp_config.username, self.smtp_config.password)
+            self._pipelining = server.has_extn('pipelining')
+        except Exception:
+            # Not yet stored in self._server, so close() cannot reach it
+            server.close()
+            raise
+        
+        return server
+    
+    def close(self) -> None:
+        """Close the SMTP connection if one is open."""
+        if self._server is None:
+            return
+        
+        try:
+            self._server.quit()
+        except (smtplib.SMTPException, OSError):
+            pass  # Connection already gone
+        finally:
+            self._server = None
     
     def _create_multipart_message(
         self,
@@ -46,35 +152,102 @@ class EmailSender:
         
         return msg
     
+    def _send_pipelined(self, msg: Message) -> None:
+        """
+        Send a message with its envelope commands pipelined (RFC 2920).
+        
+        MAIL FROM and every RCPT TO are written in one batch and their
+        replies read afterwards, instead of waiting a round trip per command.
+        """
+        from_addr = parseaddr(msg['From'])[1]
+        to_addrs = [addr for _, addr in getaddresses(msg.get_all('To', []))]
+        
+        commands = [f"MAIL FROM:<{from_addr}>"] + [f"RCPT TO:<{addr}>" for addr in to_addrs]
+        self._server.send("".join(f"{command}\r\n" for command in commands))
+        replies = [self._server.getreply() for _ in commands]
+        
+        code, resp = replies[0]
+        if code != 250:
+            self._server.rset()
+            raise smtplib.SMTPSenderRefused(code, resp, from_addr)
+        
+        refused = {
+            addr: reply
+            for addr, reply in zip(to_addrs, replies[1:])
+            if reply[0] not in (250, 251)
+        }
+        if len(refused) == len(to_addrs):
+            self._server.rset()
+            raise smtplib.SMTPRecipientsRefused(refused)
+        
+        # Flatten with CRLF line endings, as SMTP.send_message does
+        buf = io.BytesIO()
+        BytesGenerator(buf, policy=msg.policy.clone(linesep='\r\n')).flatten(msg, linesep='\r\n')
+        
+        code, resp = self._server.data(buf.getvalue())
+        if code != 250:
+            self._server.rset()
+            raise smtplib.SMTPDataError(code, resp)
+    
+    def _deliver(self, msg: Message) -> None:
+        """Send a message over the open connection, pipelining when supported."""
+        if self._pipelining:
+            self._send_pipelined(msg)
+        else:
+            self._server.send_message(msg)
+    
+    def _send_once(self, msg: Message) -> None:
+        """Send a message over the current connection, opening one if needed."""
+        if self._server is None:
+            self._server = self._connect()
+        
+        try:
+            self._deliver(msg)
+        except smtplib.SMTPServerDisconnected:
+            # Force a fresh connection on the next attempt
+            self.close()
+            raise
+        except smtplib.SMTPException:
+            # The server answered, so the connection is still usable for a retry
+            raise
+        except Exception:
+            self.close()
+            raise
+    
     @retry_with_backoff(max_attempts=3, initial_delay=2.0)
-    def _send_email(self, msg: MIMEMultipart) -> bool:
-        """Send email via SMTP."""
+    def _send_attempt(self, msg: Message) -> None:
+        """Send a message, retrying over the same connection unless it dropped."""
+        reused = self._server is not None
         try:
-            # Connect to SMTP server
-            if self.smtp_config.use_tls:
-                server = smtplib.SMTP(self.smtp_config.host, self.smtp_config.port)
-                server.starttls()
-            else:
-                server = smtplib.SMTP_SSL(self.smtp_config.host, self.smtp_config.port)
-            
-            # Login
-            server.login(self.smtp_config.username, self.smtp_config.password)
-            
-            # Send email
-            server.send_message(msg)
-            server.quit()
-            
+            self._send_once(msg)
+        except smtplib.SMTPServerDisconnected:
+            if not reused:
+                raise
+            # The shared connection went stale; reconnect once and resend
+            self.logger.info("SMTP connection was closed by the server, reconnecting")
+            self._send_once(msg)
+    
+    def _send_email(self, msg: Message) -> bool:
+        """Send email via SMTP, reusing the session connection if one is open."""
+        sent = False
+        try:
+            self._send_attempt(msg)
+            sent = True
             return True
             
         except smtplib.SMTPAuthenticationError as e:
-            self.logger.error(f"SMTP authentication failed: {e}")
+            self.logger.error("SMTP authentication failed: %s", e)
             raise
         except smtplib.SMTPException as e:
-            self.logger.error(f"SMTP error: {e}")
+            self.logger.error("SMTP error: %s", e)
             raise
         except Exception as e:
-            self.logger.error(f"Failed to send email: {e}")
+            self.logger.error("Failed to send email: %s", e)
             raise
+        finally:
+            # Keep the connection only for a session, and never after a failure
+            if not sent or not self._in_session:
+                self.close()
     
     def send_digest(self, plain_text: str, html: str, message_count: int) -> bool:
         """
@@ -86,14 +259,19 @@ class EmailSender:
             message_count: Total number of messages in digest
         
         Returns:
-            True if email sent successfully
+            True if email sent successfully, or skipped because it was empty
         """
+        # Nothing to report; skip the SMTP connection entirely
+        if message_count == 0 and not self.send_empty:
+            self.logger.info("No messages; skipping digest send")
+            return True
+        
         try:
             # Create subject line
             today = datetime.now().strftime("%B %d, %Y")
             subject = f"Daily Digest - {today} - {message_count} notifications"
             
-            self.logger.info(f"Sending digest email to {self.recipient_email}")
+            self.logger.info("Sending digest email to %s", self.recipient_email)
             
             # Create message
             msg = self._create_multipart_message(subject, plain_text, html)
@@ -101,11 +279,12 @@ class EmailSender:
             # Send email
             self._send_email(msg)
             
-            self.logger.info(f"Digest email sent successfully at {datetime.now().isoformat()}")
+            # Log records carry their own timestamp, so the clock is not read again
+            self.logger.info("Digest email sent successfully")
             return True
             
         except Exception as e:
-            self.logger.error(f"Failed to send digest email: {e}")
+            self.logger.error("Failed to send digest email: %s", e)
             raise
     
     def send_error_notification(self, error_message: str) -> bool:
@@ -119,55 +298,56 @@ class EmailSender:
             True if email sent successfully
         """
         try:
-            subject = f"Daily Digest Error - {datetime.now().strftime('%B %d, %Y')}"
+            now = datetime.now()
+            subject = f"Daily Digest Error - {now.strftime('%B %d, %Y')}"
             
-            plain_text = f"""
-Daily Digest Maker Error
-
-An error occurred while generating your daily digest:
-
-{error_message}
-
-Please check the logs for more details.
-
-Time: {datetime.now().isoformat()}
-"""
-            
-            html = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <style>
-        body {{ font-family: Arial, sans-serif; padding: 20px; }}
-        .error-box {{ 
-            background-color: #fee; 
-            border: 2px solid #c00; 
-            padding: 20px; 
-            border-radius: 5px; 
-        }}
-        h1 {{ color: #c00; }}
-    </style>
-</head>
-<body>
-    <div class="error-box">
-        <h1>Daily Digest Maker Error</h1>
-        <p>An error occurred while generating your daily digest:</p>
-        <pre>{error_message}</pre>
-        <p>Please check the logs for more details.</p>
-        <p><small>Time: {datetime.now().isoformat()}</small></p>
-    </div>
-</body>
-</html>
-"""
+            body = _ERROR_HTML.substitute(
+                error_message=html.escape(error_message),
+                time=now.isoformat()
+            )
             
             self.logger.info("Sending error notification email")
             
-            msg = self._create_multipart_message(subject, plain_text, html)
+            # A short notification needs no plain text alternative
+            msg = MIMEText(body, 'html', 'utf-8')
+            msg['Subject'] = subject
+            msg['From'] = self.smtp_config.username
+            msg['To'] = self.recipient_email
             self._send_email(msg)
             
             self.logger.info("Error notification sent successfully")
             return True
             
         except Exception as e:
-            self.logger.error(f"Failed to send error notification: {e}")
+            self.logger.error("Failed to send error notification: %s", e)
             return False
+    
+    def self_test(self, recipient: Optional[str] = None) -> bool:
+        """
+        Send a short probe email to verify the SMTP configuration.
+        
+        Uses the same connection handling as digest delivery, so within a
+        session the probe shares the session connection.
+        
+        Args:
+            recipient: Address to send the probe to, defaults to the digest recipient
+        
+        Returns:
+            True if email sent successfully
+        """
+        try:
+            msg = MIMEText("This is a test email from Daily Digest Maker", 'plain', 'utf-8')
+            msg['Subject'] = "SMTP Test - Success!"
+            msg['From'] = self.smtp_config.username
+            msg['To'] = recipient or self.recipient_email
+            
+            self.logger.info("Sending SMTP test email to %s", msg['To'])
+            self._send_email(msg)
+            
+            self.logger.info("SMTP test email sent successfully")
+            return True
+            
+        except Exception as e:
+            self.logger.error("SMTP test email failed: %s", e)
+            raise
+
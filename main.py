@@ -1,144 +1,206 @@
 """Main orchestrator for Daily Digest Maker."""
 import sys
 import logging
-from typing import List
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import ExitStack
+from typing import List, Optional, Tuple
 from datetime import datetime
 
 from config import Config
+from collectors.base import MessageCollector
 from models import Message
 from utils.logger import setup_logger
-from collectors.slack_collector import SlackCollector
-from collectors.gmail_collector import GmailCollector
-from collectors.whatsapp_collector import WhatsAppCollector
 from digest_generator import DigestGenerator
 from email_sender import EmailSender
 
 
-def collect_messages_from_all_sources(config_obj: Config, logger: logging.Logger) -> List[Message]:
+def create_collectors(config_obj: Config, logger: logging.Logger) -> List[Tuple[str, MessageCollector]]:
     """
-    Collect messages from all configured sources.
+    Create a collector for each configured source.
     
     Args:
         config_obj: Configuration object
         logger: Logger instance
     
     Returns:
-        List of all collected messages
+        List of (display name, collector) pairs in source order
     """
-    all_messages = []
+    collectors = []
+    
+    # Collector modules pull in their client libraries, so import each
+    # one only when its source is configured
     
     # Slack
     if config_obj.get_slack_token():
-        try:
-            logger.info("Collecting messages from Slack")
-            slack_collector = SlackCollector(config_obj.get_slack_token())
-            slack_messages = slack_collector.collect()
-            all_messages.extend(slack_messages)
-            logger.info(f"Collected {len(slack_messages)} messages from Slack")
-        except Exception as e:
-            logger.error(f"Slack collection failed: {e}")
+        from collectors.slack_collector import SlackCollector
+        logger.info("Collecting messages from Slack")
+        collectors.append(("Slack", SlackCollector(config_obj.get_slack_token())))
     else:
         logger.info("Slack token not configured, skipping Slack collection")
     
     # Gmail
     if config_obj.get_gmail_credentials_path():
-        try:
-            logger.info("Collecting messages from Gmail")
-            gmail_collector = GmailCollector(
-                config_obj.get_gmail_credentials_path(),
-                config_obj.get_gmail_token_path()
-            )
-            gmail_messages = gmail_collector.collect()
-            all_messages.extend(gmail_messages)
-            logger.info(f"Collected {len(gmail_messages)} messages from Gmail")
-        except Exception as e:
-            logger.error(f"Gmail collection failed: {e}")
+        from collectors.gmail_collector import GmailCollector
+        logger.info("Collecting messages from Gmail")
+        collectors.append(("Gmail", GmailCollector(
+            config_obj.get_gmail_credentials_path(),
+            config_obj.get_gmail_token_path()
+        )))
     else:
         logger.info("Gmail credentials not configured, skipping Gmail collection")
     
     # WhatsApp (placeholder) - Only enabled if configured
     if config_obj.get_enable_whatsapp_placeholder():
-        try:
-            logger.info("Collecting messages from WhatsApp (placeholder)")
-            whatsapp_collector = WhatsAppCollector()
-            whatsapp_messages = whatsapp_collector.collect()
-            all_messages.extend(whatsapp_messages)
-            logger.info(f"Collected {len(whatsapp_messages)} messages from WhatsApp")
-        except Exception as e:
-            logger.error(f"WhatsApp collection failed: {e}")
+        from collectors.whatsapp_collector import WhatsAppCollector
+        logger.info("Collecting messages from WhatsApp (placeholder)")
+        collectors.append(("WhatsApp", WhatsAppCollector()))
     else:
         logger.info("WhatsApp collection disabled (set ENABLE_WHATSAPP_PLACEHOLDER=true to enable)")
     
+    return collectors
+
+
+def collect_messages_from_all_sources(
+    config_obj: Config,
+    logger: logging.Logger,
+    collectors: Optional[List[Tuple[str, MessageCollector]]] = None
+) -> List[Message]:
+    """
+    Collect messages from all configured sources.
+    
+    Args:
+        config_obj: Configuration object
+        logger: Logger instance
+        collectors: Collectors to run, created from config_obj if not given
+    
+    Returns:
+        List of all collected messages
+    """
+    all_messages = []
+    if collectors is None:
+        collectors = create_collectors(config_obj, logger)
+    
+    if not collectors:
+        return all_messages
+    
+    # Collectors are network-bound, so run them concurrently
+    results: List[List[Message]] = [[] for _ in collectors]
+    with ThreadPoolExecutor(max_workers=len(collectors)) as executor:
+        futures = {
+            executor.submit(collector.collect): index
+            for index, (_, collector) in enumerate(collectors)
+        }
+        for future in as_completed(futures):
+            index = futures[future]
+            name = collectors[index][0]
+            try:
+                results[index] = future.result()
+                logger.info("Collected %s messages from %s", len(results[index]), name)
+            except Exception as e:
+                logger.error("%s collection failed: %s", name, e)
+    
+    # Combine in configured source order, independent of completion order
+    for messages in results:
+        all_messages.extend(messages)
+    
     return all_messages
 
 
+def commit_collector_cursors(collectors: List[Tuple[str, MessageCollector]], logger: logging.Logger) -> None:
+    """
+    Tell each collector its messages were delivered so it can advance its cursors.
+    
+    Args:
+        collectors: Collectors whose messages were delivered
+        logger: Logger instance
+    """
+    for name, collector in collectors:
+        try:
+            collector.commit_cursors()
+        except Exception as e:
+            logger.warning("Failed to commit %s cursors: %s", name, e)
+
+
 def main():
     """Main orchestrator function."""
     logger = None
+    email_sender = None
     
-    try:
-        # Load configuration
-        config_obj = Config('.env')
-        
-        # Setup logger
-        logger = setup_logger('daily_digest_maker', config_obj.get_log_level())
-        logger.info("=" * 60)
-        logger.info("Daily Digest Maker - Starting execution")
-        logger.info(f"Execution time: {datetime.now().isoformat()}")
-        logger.info("=" * 60)
-        
-        # Validate configuration
+    with ExitStack() as stack:
         try:
-            config_obj.validate()
-            logger.info("Configuration validated successfully")
-        except ValueError as e:
-            logger.error(f"Configuration validation failed: {e}")
-            sys.exit(1)
-        
-        # Get app config
-        app_config = config_obj.get_app_config()
-        
-        # Collect messages from all sources
-        logger.info("Starting message collection from all sources")
-        all_messages = collect_messages_from_all_sources(config_obj, logger)
-        logger.info(f"Total messages collected: {len(all_messages)}")
-        
-        # Generate digest
-        logger.info("Generating digest")
-        digest_generator = DigestGenerator()
-        plain_text, html = digest_generator.generate(all_messages)
-        
-        # Send email
-        logger.info("Sending digest email")
-        email_sender = EmailSender(app_config.smtp, app_config.recipient_email)
-        email_sender.send_digest(plain_text, html, len(all_messages))
-        
-        # Log success
-        logger.info("=" * 60)
-        logger.info("Daily Digest Maker - Execution completed successfully")
-        logger.info(f"Messages processed: {len(all_messages)}")
-        logger.info(f"Completion time: {datetime.now().isoformat()}")
-        logger.info("=" * 60)
-        
-    except Exception as e:
-        if logger:
-            logger.error("=" * 60)
-            logger.error("Daily Digest Maker - Execution failed")
-            logger.error(f"Error: {e}", exc_info=True)
-            logger.error("=" * 60)
+            # Load configuration
+            config_obj = Config('.env')
             
-            # Try to send error notification
+            # Setup logger
+            logger = setup_logger('daily_digest_maker', config_obj.get_log_level())
+            logger.info("=" * 60)
+            logger.info("Daily Digest Maker - Starting execution")
+            logger.info("Execution time: %s", datetime.now().isoformat())
+            logger.info("=" * 60)
+            
+            # Validate configuration
             try:
-                config_obj = Config('.env')
-                app_config = config_obj.get_app_config()
-                email_sender = EmailSender(app_config.smtp, app_config.recipient_email)
-                email_sender.send_error_notification(str(e))
-            except Exception as notify_error:
-                logger.error(f"Failed to send error notification: {notify_error}")
-        else:
-            print(f"Fatal error: {e}")
-        
-        sys.exit(1)
+                config_obj.validate()
+                logger.info("Configuration validated successfully")
+            except ValueError as e:
+                logger.error("Configuration validation failed: %s", e)
+                sys.exit(1)
+            
+            # Get app config
+            app_config = config_obj.get_app_config()
+            
+            # One SMTP session is shared by the digest and any error notification
+            email_sender = stack.enter_context(
+                EmailSender(app_config.smtp, app_config.recipient_email, app_config.send_empty_digest)
+            )
+            
+            # Collect messages from all sources
+            logger.info("Starting message collection from all sources")
+            collectors = create_collectors(config_obj, logger)
+            all_messages = collect_messages_from_all_sources(config_obj, logger, collectors)
+            logger.info("Total messages collected: %s", len(all_messages))
+            
+            # Generate digest
+            logger.info("Generating digest")
+            digest_generator = DigestGenerator()
+            plain_text, html = digest_generator.generate(all_messages)
+            
+            # Send email
+            logger.info("Sending digest email")
+            email_sender.send_digest(plain_text, html, len(all_messages))
+            
+            # Only now is it safe to skip these messages on the next run
+            commit_collector_cursors(collectors, logger)
+            
+            # Log success
+            logger.info("=" * 60)
+            logger.info("Daily Digest Maker - Execution completed successfully")
+            logger.info("Messages processed: %s", len(all_messages))
+            logger.info("Completion time: %s", datetime.now().isoformat())
+            logger.info("=" * 60)
+            
+        except Exception as e:
+            if logger:
+                logger.error("=" * 60)
+                logger.error("Daily Digest Maker - Execution failed")
+                logger.error("Error: %s", e, exc_info=True)
+                logger.error("=" * 60)
+                
+                # Try to send error notification
+                try:
+                    if email_sender is None:
+                        config_obj = Config('.env')
+                        app_config = config_obj.get_app_config()
+                        email_sender = stack.enter_context(
+                            EmailSender(app_config.smtp, app_config.recipient_email)
+                        )
+                    email_sender.send_error_notification(str(e))
+                except Exception as notify_error:
+                    logger.error("Failed to send error notification: %s", notify_error)
+            else:
+                print(f"Fatal error: {e}")
+            
+            sys.exit(1)
 
 
 if __name__ == "__main__":
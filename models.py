@@ -1,12 +1,19 @@
 """Data models for the Daily Digest Maker."""
-from dataclasses import dataclass, asdict
+import heapq
+import sys
+from dataclasses import dataclass, field
+from operator import attrgetter
 from datetime import datetime
 from typing import Dict, List, Optional
 
 
-@dataclass
+# Slotted dataclasses need Python 3.10+; older versions fall back to __dict__
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_SLOTS)
 class Message:
-    """Represents a message from any platform."""
+    """Represents a message from any platform. Instances are immutable."""
     source: str          # "slack", "gmail", "whatsapp"
     sender: str          # Sender name or email
     sender_detail: str   # Channel name, email address, or phone number
@@ -16,37 +23,72 @@ class Message:
     
     def to_dict(self) -> dict:
         """Convert message to dictionary."""
-        data = asdict(self)
-        data['timestamp'] = self.timestamp.isoformat()
-        return data
+        return {
+            'source': self.source,
+            'sender': self.sender,
+            'sender_detail': self.sender_detail,
+            'content': self.content,
+            'timestamp': self.timestamp.isoformat(),
+            'message_type': self.message_type
+        }
     
     @staticmethod
     def from_dict(data: dict) -> 'Message':
         """Create message from dictionary."""
-        data['timestamp'] = datetime.fromisoformat(data['timestamp'])
-        return Message(**data)
+        return Message(
+            source=data['source'],
+            sender=data['sender'],
+            sender_detail=data['sender_detail'],
+            content=data['content'],
+            timestamp=datetime.fromisoformat(data['timestamp']),
+            message_type=data['message_type']
+        )
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class DigestData:
-    """Container for digest data."""
+    """
+    Container for digest data.
+    
+    Instances are frozen, and the per-source lists must not be modified
+    after construction; per-source counts are computed once up front.
+    """
     messages_by_source: Dict[str, List[Message]]
     total_count: int
     generation_time: datetime
+    _counts: Dict[str, int] = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        """Precompute message counts per source."""
+        object.__setattr__(self, '_counts', {
+            source: len(messages) for source, messages in self.messages_by_source.items()
+        })
     
     def get_source_count(self, source: str) -> int:
         """Get count of messages for a specific source."""
-        return len(self.messages_by_source.get(source, []))
+        return self._counts.get(source, 0)
     
     def get_all_messages_sorted(self) -> List[Message]:
-        """Get all messages sorted by timestamp descending."""
-        all_messages = []
-        for messages in self.messages_by_source.values():
-            all_messages.extend(messages)
-        return sorted(all_messages, key=lambda m: m.timestamp, reverse=True)
+        """
+        Get all messages sorted by timestamp descending.
+        
+        Each list in messages_by_source must already be sorted by timestamp
+        descending; the per-source lists are merged rather than re-sorted.
+        """
+        assert all(
+            messages[i].timestamp >= messages[i + 1].timestamp
+            for messages in self.messages_by_source.values()
+            for i in range(len(messages) - 1)
+        ), "messages_by_source lists must be sorted by timestamp descending"
+        
+        return list(heapq.merge(
+            *self.messages_by_source.values(),
+            key=attrgetter('timestamp'),
+            reverse=True
+        ))
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class SMTPConfig:
     """SMTP configuration."""
     host: str
@@ -56,7 +98,7 @@ class SMTPConfig:
     use_tls: bool = True
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class AppConfig:
     """Application configuration."""
     slack_token: Optional[str]
@@ -66,3 +108,4 @@ class AppConfig:
     recipient_email: str
     schedule_time: str = "20:00"
     log_level: str = "INFO"
+    send_empty_digest: bool = False
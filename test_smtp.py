@@ -1,28 +1,21 @@
 """Simple SMTP test script to verify email credentials."""
 import smtplib
-from email.mime.text import MIMEText
-import os
-from dotenv import load_dotenv
+import sys
+from email_sender import EmailSender
 
-# Load .env file
-load_dotenv()
-
-# Get credentials
-smtp_host = os.getenv('SMTP_HOST')
-smtp_port = int(os.getenv('SMTP_PORT'))
-smtp_username = os.getenv('SMTP_USERNAME')
-smtp_password = os.getenv('SMTP_PASSWORD')
-recipient = os.getenv('RECIPIENT_EMAIL')
+sender = EmailSender.from_env()
+smtp_config = sender.smtp_config
+smtp_password = smtp_config.password
 
 print("=" * 60)
 print("SMTP Configuration Test")
 print("=" * 60)
-print(f"Host: {smtp_host}")
-print(f"Port: {smtp_port}")
-print(f"Username: {smtp_username}")
+print(f"Host: {smtp_config.host}")
+print(f"Port: {smtp_config.port}")
+print(f"Username: {smtp_config.username}")
 print(f"Password: {'*' * len(smtp_password) if smtp_password else 'NOT SET'}")
 print(f"Password length: {len(smtp_password) if smtp_password else 0} characters")
-print(f"Recipient: {recipient}")
+print(f"Recipient: {sender.recipient_email}")
 print("=" * 60)
 
 # Check for common issues
@@ -39,31 +32,17 @@ if issues:
     for issue in issues:
         print(f"  {issue}")
     print("\nPlease fix these issues in your .env file")
-    exit(1)
+    sys.exit(1)
 
 print("\n✅ Configuration looks good!")
 print("\nTesting SMTP connection...")
 
 try:
-    # Connect to SMTP server
-    server = smtplib.SMTP(smtp_host, smtp_port)
-    server.starttls()
-    print("✅ Connected to SMTP server")
-    
-    # Try to login
-    server.login(smtp_username, smtp_password)
-    print("✅ Login successful!")
-    
-    # Send test email
-    msg = MIMEText("This is a test email from Daily Digest Maker")
-    msg['Subject'] = "SMTP Test - Success!"
-    msg['From'] = smtp_username
-    msg['To'] = recipient
-    
-    server.send_message(msg)
+    # Connect, log in and send a probe through the same path as the digest
+    with sender:
+        sender.self_test()
     print("✅ Test email sent successfully!")
     
-    server.quit()
     print("\n" + "=" * 60)
     print("SUCCESS! Your SMTP configuration is working!")
     print("=" * 60)
@@ -1,27 +1,31 @@
 """Property-based tests for Message data model."""
+import dataclasses
 import pytest
 from hypothesis import given, strategies as st
 from datetime import datetime, timedelta
 from models import Message
 
 
+# Reusable strategies for generating test data
+_NOW = datetime.now()
+_SOURCES = st.sampled_from(["slack", "gmail", "whatsapp"])
+_MESSAGE_TYPES = st.sampled_from(["channel", "direct", "email", "chat"])
+_NAME_TEXT = st.text(min_size=1, max_size=100)
+_CONTENT_TEXT = st.text(min_size=1, max_size=500)
+_TIMESTAMPS = st.datetimes(min_value=_NOW - timedelta(days=365), max_value=_NOW)
+
+
 # Custom strategies for generating test data
 @st.composite
 def message_strategy(draw):
     """Generate random Message objects."""
-    sources = ["slack", "gmail", "whatsapp"]
-    message_types = ["channel", "direct", "email", "chat"]
-    
     return Message(
-        source=draw(st.sampled_from(sources)),
-        sender=draw(st.text(min_size=1, max_size=100)),
-        sender_detail=draw(st.text(min_size=1, max_size=100)),
-        content=draw(st.text(min_size=1, max_size=500)),
-        timestamp=draw(st.datetimes(
-            min_value=datetime.now() - timedelta(days=365),
-            max_value=datetime.now()
-        )),
-        message_type=draw(st.sampled_from(message_types))
+        source=draw(_SOURCES),
+        sender=draw(_NAME_TEXT),
+        sender_detail=draw(_NAME_TEXT),
+        content=draw(_CONTENT_TEXT),
+        timestamp=draw(_TIMESTAMPS),
+        message_type=draw(_MESSAGE_TYPES)
     )
 
 
@@ -83,3 +87,17 @@ class TestMessageProperties:
         
         # Timestamps should be equal (within microsecond precision)
         assert abs((restored_message.timestamp - message.timestamp).total_seconds()) < 0.001
+    
+    @given(message_strategy())
+    def test_message_is_immutable(self, message):
+        """
+        Test that message fields cannot be reassigned.
+        
+        For any message, assigning to a field should fail and leave it unchanged.
+        """
+        original_content = message.content
+        
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            message.content = "changed"
+        
+        assert message.content == original_content
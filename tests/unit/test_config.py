@@ -63,3 +63,52 @@ class TestConfig:
         
         config = Config()
         assert config.get_schedule_time() == '09:00'
+    
+    def test_send_empty_digest_defaults_to_false(self):
+        """Test that empty digests are skipped by default."""
+        config = Config()
+        assert config.get_send_empty_digest() is False
+        assert config.get_app_config().send_empty_digest is False
+    
+    def test_send_empty_digest_enabled(self, monkeypatch):
+        """Test enabling empty digests from the environment."""
+        monkeypatch.setenv('SEND_EMPTY_DIGEST', 'true')
+        
+        config = Config()
+        assert config.get_app_config().send_empty_digest is True
+    
+    def test_app_config_snapshot_at_construction(self, monkeypatch):
+        """Test that app config and validation use values loaded at construction."""
+        monkeypatch.setenv('SMTP_USERNAME', 'test@example.com')
+        monkeypatch.setenv('SMTP_PASSWORD', 'testpass')
+        monkeypatch.setenv('RECIPIENT_EMAIL', 'recipient@example.com')
+        
+        config = Config()
+        monkeypatch.delenv('RECIPIENT_EMAIL')
+        
+        assert config.get_app_config().recipient_email == 'recipient@example.com'
+        assert config.validate() is True
+    
+    def test_malformed_smtp_port_reported_by_validate(self, monkeypatch):
+        """Test that a non-numeric SMTP_PORT fails validation instead of construction."""
+        monkeypatch.setenv('SMTP_PORT', 'abc')
+        
+        config = Config()
+        
+        with pytest.raises(ValueError) as exc_info:
+            config.validate()
+        
+        assert "SMTP_PORT must be a number, got 'abc'" in str(exc_info.value)
+    
+    def test_env_file_does_not_modify_process_environment(self, monkeypatch, tmp_path):
+        """Test that .env values are read without touching os.environ or overriding it."""
+        monkeypatch.delenv('RECIPIENT_EMAIL', raising=False)
+        monkeypatch.setenv('SMTP_USERNAME', 'env@example.com')
+        env_file = tmp_path / '.env'
+        env_file.write_text('RECIPIENT_EMAIL=file@example.com\nSMTP_USERNAME=file@example.com\n')
+        
+        config = Config(str(env_file))
+        
+        assert config.get_recipient_email() == 'file@example.com'
+        assert config.get_smtp_settings().username == 'env@example.com'
+        assert 'RECIPIENT_EMAIL' not in os.environ
@@ -1,4 +1,5 @@
 """Unit tests for digest generator."""
+import io
 import pytest
 from datetime import datetime, timedelta
 from models import Message
@@ -133,3 +134,15 @@ class TestDigestGenerator:
         assert sorted_messages[0].source == "whatsapp"  # 30 min ago
         assert sorted_messages[1].source == "gmail"     # 1 hour ago
         assert sorted_messages[2].source == "slack"     # 2 hours ago
+    
+    def test_generate_to_matches_generate(self, sample_messages):
+        """Test that streaming generation writes the same digests as generate."""
+        generator = DigestGenerator()
+        text_writer = io.StringIO()
+        html_writer = io.StringIO()
+        
+        generator.generate_to(sample_messages, text_writer, html_writer)
+        plain_text, html = generator.generate(sample_messages)
+        
+        assert text_writer.getvalue() == plain_text
+        assert html_writer.getvalue() == html
@@ -0,0 +1,269 @@
+"""Unit tests for the email sender."""
+import smtplib
+import pytest
+import email_sender
+import utils.retry
+from email_sender import EmailSender
+from models import SMTPConfig
+
+
+@pytest.fixture
+def smtp_config():
+    """SMTP configuration pointing at an unreachable host."""
+    return SMTPConfig(
+        host='smtp.invalid',
+        port=587,
+        username='sender@example.com',
+        password='secret',
+        use_tls=True
+    )
+
+
+class FakeSMTP:
+    """
+    Fake SMTP connection whose sends fail with errors queued on the class.
+    
+    With pipelining enabled, envelope and DATA replies are taken from the
+    queues on the class, defaulting to 250 once they run out.
+    """
+    
+    instances = []
+    errors = []
+    pipelining = False
+    replies = []
+    data_replies = []
+    
+    def __init__(self, host, port):
+        self.sent = []
+        self.commands = []
+        self.data_sent = []
+        self.resets = 0
+        self.closed = False
+        FakeSMTP.instances.append(self)
+    
+    def starttls(self):
+        pass
+    
+    def login(self, username, password):
+        pass
+    
+    def has_extn(self, name):
+        return name == 'pipelining' and FakeSMTP.pipelining
+    
+    def send_message(self, msg):
+        if FakeSMTP.errors:
+            raise FakeSMTP.errors.pop(0)
+        self.sent.append(msg)
+    
+    def send(self, data):
+        self.commands.extend(data.split('\r\n')[:-1])
+    
+    def getreply(self):
+        if FakeSMTP.replies:
+            return FakeSMTP.replies.pop(0)
+        return 250, b'OK'
+    
+    def data(self, msg):
+        self.data_sent.append(msg)
+        if FakeSMTP.data_replies:
+            return FakeSMTP.data_replies.pop(0)
+        return 250, b'OK'
+    
+    def rset(self):
+        self.resets += 1
+    
+    def quit(self):
+        self.closed = True
+    
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_smtp(monkeypatch):
+    """Replace smtplib.SMTP with FakeSMTP and skip retry delays."""
+    FakeSMTP.instances = []
+    FakeSMTP.errors = []
+    FakeSMTP.pipelining = False
+    FakeSMTP.replies = []
+    FakeSMTP.data_replies = []
+    monkeypatch.setattr(email_sender.smtplib, 'SMTP', FakeSMTP)
+    monkeypatch.setattr(utils.retry.time, 'sleep', lambda delay: None)
+    return FakeSMTP
+
+
+class TestSendEmailRetries:
+    """Unit tests for connection handling across send retries."""
+    
+    def test_retry_reuses_connection_after_smtp_error(self, fake_smtp, smtp_config):
+        """Test that a transient SMTP error is retried over the same connection."""
+        fake_smtp.errors = [smtplib.SMTPDataError(451, b'try again later')]
+        
+        sender = EmailSender(smtp_config, 'recipient@example.com')
+        assert sender.send_error_notification("boom") is True
+        
+        assert len(fake_smtp.instances) == 1
+        assert len(fake_smtp.instances[0].sent) == 1
+        assert fake_smtp.instances[0].closed
+    
+    def test_retry_reconnects_after_disconnect(self, fake_smtp, smtp_config):
+        """Test that a dropped connection is replaced on the next attempt."""
+        fake_smtp.errors = [smtplib.SMTPServerDisconnected('gone')]
+        
+        sender = EmailSender(smtp_config, 'recipient@example.com')
+        assert sender.send_error_notification("boom") is True
+        
+        assert len(fake_smtp.instances) == 2
+        assert fake_smtp.instances[0].closed
+        assert len(fake_smtp.instances[1].sent) == 1
+    
+    def test_connection_closed_when_login_fails(self, fake_smtp, smtp_config, monkeypatch):
+        """Test that a connection failing authentication is closed before the retry."""
+        def fail_login(self, username, password):
+            raise smtplib.SMTPAuthenticationError(535, b'bad credentials')
+        
+        monkeypatch.setattr(FakeSMTP, 'login', fail_login)
+        
+        sender = EmailSender(smtp_config, 'recipient@example.com')
+        assert sender.send_error_notification("boom") is False
+        
+        assert len(fake_smtp.instances) == 3
+        assert all(server.closed for server in fake_smtp.instances)
+        assert sender._server is None
+    
+    def test_connection_closed_after_final_failure(self, fake_smtp, smtp_config):
+        """Test that the connection is closed once all attempts fail."""
+        fake_smtp.errors = [smtplib.SMTPDataError(451, b'try again later') for _ in range(3)]
+        
+        sender = EmailSender(smtp_config, 'recipient@example.com')
+        assert sender.send_error_notification("boom") is False
+        
+        assert len(fake_smtp.instances) == 1
+        assert fake_smtp.instances[0].closed
+        assert sender._server is None
+
+
+class TestSendPipelined:
+    """Unit tests for sending with pipelined envelope commands."""
+    
+    @pytest.fixture
+    def sender(self, fake_smtp, smtp_config):
+        """Sender with an open connection to a server that supports PIPELINING."""
+        fake_smtp.pipelining = True
+        sender = EmailSender(smtp_config, 'recipient@example.com')
+        sender._server = sender._connect()
+        return sender
+    
+    def _message(self, sender):
+        """Build a digest-style message to send."""
+        return sender._create_multipart_message('Subject', 'plain', '<p>html</p>')
+    
+    def test_pipelined_send(self, fake_smtp, smtp_config):
+        """Test that envelope commands are sent in one batch before DATA."""
+        fake_smtp.pipelining = True
+        
+        sender = EmailSender(smtp_config, 'recipient@example.com')
+        assert sender.send_error_notification("boom") is True
+        
+        server, = fake_smtp.instances
+        assert server.commands == ['MAIL FROM:<sender@example.com>', 'RCPT TO:<recipient@example.com>']
+        assert server.sent == []
+        data, = server.data_sent
+        assert b'\r\nTo: recipient@example.com\r\n' in data
+        assert server.resets == 0
+    
+    def test_sender_refused(self, sender, fake_smtp):
+        """Test that a refused MAIL FROM resets the transaction."""
+        fake_smtp.replies = [(550, b'sender rejected'), (250, b'OK')]
+        
+        with pytest.raises(smtplib.SMTPSenderRefused) as exc_info:
+            sender._send_pipelined(self._message(sender))
+        
+        assert exc_info.value.sender == 'sender@example.com'
+        assert sender._server.resets == 1
+        assert sender._server.data_sent == []
+    
+    def test_all_recipients_refused(self, sender, fake_smtp):
+        """Test that refusing every RCPT TO resets the transaction."""
+        fake_smtp.replies = [(250, b'OK'), (550, b'no such user')]
+        
+        with pytest.raises(smtplib.SMTPRecipientsRefused) as exc_info:
+            sender._send_pipelined(self._message(sender))
+        
+        assert exc_info.value.recipients == {'recipient@example.com': (550, b'no such user')}
+        assert sender._server.resets == 1
+        assert sender._server.data_sent == []
+    
+    def test_data_error(self, sender, fake_smtp):
+        """Test that a rejected DATA resets the transaction."""
+        fake_smtp.data_replies = [(554, b'message rejected')]
+        
+        with pytest.raises(smtplib.SMTPDataError) as exc_info:
+            sender._send_pipelined(self._message(sender))
+        
+        assert exc_info.value.smtp_code == 554
+        assert sender._server.resets == 1
+
+
+class TestSendDigest:
+    """Unit tests for EmailSender.send_digest."""
+    
+    def test_empty_digest_is_skipped(self, monkeypatch, smtp_config):
+        """Test that an empty digest is not sent and no connection is opened."""
+        def fail_connect(*args, **kwargs):
+            raise AssertionError("SMTP connection should not be opened")
+        
+        monkeypatch.setattr(email_sender.smtplib, 'SMTP', fail_connect)
+        
+        sender = EmailSender(smtp_config, 'recipient@example.com')
+        assert sender.send_digest("plain", "<p>html</p>", 0) is True
+    
+    def test_empty_digest_is_sent_when_enabled(self, monkeypatch, smtp_config):
+        """Test that send_empty sends the digest even with no messages."""
+        sent = []
+        monkeypatch.setattr(EmailSender, '_send_email', lambda self, msg: sent.append(msg) or True)
+        
+        sender = EmailSender(smtp_config, 'recipient@example.com', send_empty=True)
+        assert sender.send_digest("plain", "<p>html</p>", 0) is True
+        
+        assert len(sent) == 1
+        assert sent[0]['Subject'].endswith('- 0 notifications')
+
+
+class TestSendErrorNotification:
+    """Unit tests for EmailSender.send_error_notification."""
+    
+    def test_error_notification_is_single_part_html(self, fake_smtp, smtp_config):
+        """Test that the notification is one escaped text/html part."""
+        sender = EmailSender(smtp_config, 'recipient@example.com')
+        assert sender.send_error_notification("<class 'ValueError'>") is True
+        
+        msg, = fake_smtp.instances[0].sent
+        assert not msg.is_multipart()
+        assert msg.get_content_type() == 'text/html'
+        assert msg['To'] == 'recipient@example.com'
+        assert "&lt;class &#x27;ValueError&#x27;&gt;" in msg.get_payload(decode=True).decode('utf-8')
+
+
+class TestSelfTest:
+    """Unit tests for EmailSender.from_env and self_test."""
+    
+    def test_from_env_uses_configuration(self, monkeypatch):
+        """Test that from_env builds a sender from environment settings."""
+        monkeypatch.setenv('SMTP_USERNAME', 'sender@example.com')
+        monkeypatch.setenv('RECIPIENT_EMAIL', 'recipient@example.com')
+        
+        sender = EmailSender.from_env(None)
+        
+        assert sender.smtp_config.username == 'sender@example.com'
+        assert sender.recipient_email == 'recipient@example.com'
+    
+    def test_self_test_shares_session_connection(self, fake_smtp, smtp_config):
+        """Test that the probe and a later send share one session connection."""
+        with EmailSender(smtp_config, 'recipient@example.com') as sender:
+            assert sender.self_test('probe@example.com') is True
+            sender.send_error_notification("boom")
+        
+        assert len(fake_smtp.instances) == 1
+        probe, _ = fake_smtp.instances[0].sent
+        assert probe['To'] == 'probe@example.com'
@@ -0,0 +1,154 @@
+"""Unit tests for the Gmail collector."""
+import pytest
+import collectors.gmail_collector
+from collectors.gmail_collector import GmailCollector
+
+
+class FakeResponse:
+    """Stand-in for the httplib2 response attached to an HttpError."""
+    
+    def __init__(self, status):
+        self.status = status
+
+
+class FakeHttpError(Exception):
+    """Stand-in for googleapiclient.errors.HttpError."""
+    
+    def __init__(self, status, reason=''):
+        super().__init__(f"<HttpError {status} \"{reason}\">")
+        self.resp = FakeResponse(status)
+
+
+class FakeBatch:
+    """Fake batch request answering each part from the service's failure script."""
+    
+    def __init__(self, service, callback):
+        self.service = service
+        self.callback = callback
+        self.ids = []
+    
+    def add(self, request, request_id):
+        self.ids.append(request_id)
+    
+    def execute(self):
+        self.service.batches.append(list(self.ids))
+        for msg_id in self.ids:
+            errors = self.service.failures.get(msg_id)
+            if errors:
+                self.callback(msg_id, None, errors.pop(0))
+            else:
+                self.callback(msg_id, {'id': msg_id, 'payload': {'headers': []}}, None)
+
+
+class FakeGmailService:
+    """Fake Gmail service whose batch parts fail according to a script."""
+    
+    def __init__(self, failures=None):
+        # Message ID -> list of errors returned by its next fetches
+        self.failures = failures or {}
+        self.batches = []
+    
+    def users(self):
+        return self
+    
+    def messages(self):
+        return self
+    
+    def get(self, **kwargs):
+        return kwargs
+    
+    def new_batch_http_request(self, callback):
+        return FakeBatch(self, callback)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record backoff sleeps instead of waiting."""
+    calls = []
+    monkeypatch.setattr(collectors.gmail_collector.time, 'sleep', calls.append)
+    return calls
+
+
+def make_collector(service):
+    """Create a Gmail collector backed by a fake service."""
+    collector = GmailCollector('credentials.json', 'token.json')
+    collector.service = service
+    return collector
+
+
+class TestGmailBatchRetries:
+    """Test retrying failed parts of batch requests."""
+    
+    def test_batches_respect_batch_size(self, sleeps):
+        """Test that message IDs are split into batches of BATCH_SIZE."""
+        service = FakeGmailService()
+        ids = [f'm{i}' for i in range(GmailCollector.BATCH_SIZE + 1)]
+        
+        messages = make_collector(service)._get_messages(ids)
+        
+        assert [m['id'] for m in messages] == ids
+        assert [len(batch) for batch in service.batches] == [GmailCollector.BATCH_SIZE, 1]
+        assert sleeps == []
+    
+    def test_rate_limited_parts_are_rebatched(self, sleeps):
+        """Test that only the rate-limited parts are fetched again."""
+        service = FakeGmailService({
+            'm1': [FakeHttpError(429)],
+            'm3': [FakeHttpError(503), FakeHttpError(403, 'userRateLimitExceeded')],
+        })
+        
+        messages = make_collector(service)._get_messages(['m0', 'm1', 'm2', 'm3'])
+        
+        assert sorted(m['id'] for m in messages) == ['m0', 'm1', 'm2', 'm3']
+        assert service.batches == [['m0', 'm1', 'm2', 'm3'], ['m1', 'm3'], ['m3']]
+        assert len(sleeps) == 2
+    
+    def test_non_retryable_parts_are_dropped(self, sleeps):
+        """Test that a part failing with a client error is not fetched again."""
+        service = FakeGmailService({'m1': [FakeHttpError(404, 'Not Found')]})
+        
+        messages = make_collector(service)._get_messages(['m0', 'm1'])
+        
+        assert [m['id'] for m in messages] == ['m0']
+        assert service.batches == [['m0', 'm1']]
+        assert sleeps == []
+    
+    def test_gives_up_after_part_attempts(self, sleeps):
+        """Test that a part failing every attempt is dropped after PART_ATTEMPTS."""
+        service = FakeGmailService({'m1': [FakeHttpError(500)] * 10})
+        
+        messages = make_collector(service)._get_messages(['m0', 'm1'])
+        
+        assert [m['id'] for m in messages] == ['m0']
+        assert len(service.batches) == GmailCollector.PART_ATTEMPTS
+        assert len(sleeps) == GmailCollector.PART_ATTEMPTS - 1
+
+
+
+def make_email(from_header):
+    """Build a Gmail metadata resource with the given From header."""
+    return {
+        'id': 'm1',
+        'payload': {'headers': [
+            {'name': 'From', 'value': from_header},
+            {'name': 'Subject', 'value': 'Hello'},
+            {'name': 'Date', 'value': 'Mon, 02 Oct 2023 10:00:00 +0000'},
+        ]}
+    }
+
+
+class TestParseMessage:
+    """Test building messages from Gmail headers."""
+    
+    @pytest.mark.parametrize('from_header, sender, sender_detail', [
+        ('"Jane Doe" <jane@example.com>', 'Jane Doe', 'jane@example.com'),
+        ('jane@example.com', 'jane@example.com', 'jane@example.com'),
+        ('Mailer Daemon', 'Mailer Daemon', 'Mailer Daemon'),
+        ('', '', ''),
+    ])
+    def test_sender_parsing(self, from_header, sender, sender_detail):
+        """Test that senders are parsed, keeping the raw header when it has no address."""
+        message = make_collector(FakeGmailService())._parse_message(make_email(from_header))
+        
+        assert message.sender == sender
+        assert message.sender_detail == sender_detail
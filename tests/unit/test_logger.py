@@ -0,0 +1,207 @@
+"""Unit tests for logging utilities."""
+import logging
+import time
+import utils.logger
+from utils.logger import BufferedRotatingFileHandler, CachedTimeFormatter, CredentialSanitizer, setup_logger
+
+
+def make_record(msg, args=None):
+    """Create a log record with the given message and arguments."""
+    return logging.LogRecord('test', logging.INFO, __file__, 1, msg, args, None)
+
+
+class TestCredentialSanitizer:
+    """Unit tests for CredentialSanitizer."""
+    
+    def test_message_without_credentials_is_unchanged(self):
+        """Test that ordinary messages pass through untouched."""
+        record = make_record("Collected 12 messages from Slack")
+        
+        assert CredentialSanitizer().filter(record) is True
+        assert record.getMessage() == "Collected 12 messages from Slack"
+    
+    def test_credential_in_message_is_redacted(self):
+        """Test that credentials in the message are redacted."""
+        record = make_record("Connecting with password=hunter2 and Bearer abc.def")
+        
+        CredentialSanitizer().filter(record)
+        
+        assert record.getMessage() == "Connecting with password=***REDACTED*** and Bearer ***REDACTED***"
+    
+    def test_each_credential_format_is_redacted(self):
+        """Test that every credential format is redacted in a single message."""
+        record = make_record(
+            '{"token": "t0k", "password": "pw"} api-key=k3y secret: s3c Bearer b34r xoxp-1-2'
+        )
+        
+        CredentialSanitizer().filter(record)
+        
+        assert record.getMessage() == (
+            '{"token": "***REDACTED***", "password": "***REDACTED***"} '
+            'api-key=***REDACTED*** secret: ***REDACTED*** Bearer ***REDACTED*** ***REDACTED***'
+        )
+    
+    def test_non_ascii_case_variants_are_redacted(self):
+        """Test that keys matched only by Unicode case folding are still redacted."""
+        # U+017F LATIN SMALL LETTER LONG S folds to 's'
+        record = make_record("Using \u017fecret=abc123")
+        
+        CredentialSanitizer().filter(record)
+        
+        assert record.getMessage() == "Using \u017fecret=***REDACTED***"
+    
+    def test_credential_in_args_is_redacted(self):
+        """Test that credentials passed as logging arguments are redacted."""
+        record = make_record("Slack client %s using %s", ("ready", "xoxb-123-456"))
+        
+        CredentialSanitizer().filter(record)
+        
+        assert record.getMessage() == "Slack client ready using ***REDACTED***"
+    
+    def test_credential_split_between_format_and_args_is_redacted(self):
+        """Test that a key in the format string and its value in args are redacted together."""
+        record = make_record("Connecting with token=%s", ("abc123",))
+        
+        CredentialSanitizer().filter(record)
+        
+        assert record.getMessage() == "Connecting with token=***REDACTED***"
+    
+    def test_malformed_record_is_still_sanitized(self):
+        """Test that a record whose arguments do not match its format is still sanitized."""
+        record = make_record("password=hunter2 %s %s", ("only one",))
+        
+        CredentialSanitizer().filter(record)
+        
+        assert record.msg == "password=***REDACTED*** %s %s"
+    
+    def test_args_without_credentials_are_unchanged(self):
+        """Test that ordinary arguments are left as they were."""
+        args = ("slack", 12)
+        record = make_record("Collected from %s: %d", args)
+        
+        CredentialSanitizer().filter(record)
+        
+        assert record.args is args
+    
+    def test_long_quote_heavy_message_is_sanitized_in_linear_time(self):
+        """Test that a 1MB message full of near-miss credentials is handled quickly."""
+        # Every chunk starts like a credential but never completes one
+        chunk = 'token "\'" : password\t" bearer\'}'
+        message = chunk * (1024 * 1024 // len(chunk))
+        record = make_record(message)
+        
+        start = time.perf_counter()
+        CredentialSanitizer().filter(record)
+        elapsed = time.perf_counter() - start
+        
+        # Linear matching takes well under a second; backtracking would take minutes
+        assert elapsed < 2.0
+        assert record.msg == message
+
+
+class TestCachedTimeFormatter:
+    """Unit tests for CachedTimeFormatter."""
+    
+    def test_timestamp_matches_standard_formatter(self):
+        """Test that cached timestamps match the standard formatter across seconds."""
+        datefmt = '%Y-%m-%d %H:%M:%S'
+        cached = CachedTimeFormatter('%(asctime)s', datefmt=datefmt)
+        standard = logging.Formatter('%(asctime)s', datefmt=datefmt)
+        
+        for created in [1700000000.1, 1700000000.9, 1700000001.0, 1700000001.5, 1700000000.2]:
+            record = make_record("message")
+            record.created = created
+            assert cached.format(record) == standard.format(record)
+    
+    def test_default_format_keeps_milliseconds(self):
+        """Test that timestamps without a datefmt are not cached."""
+        formatter = CachedTimeFormatter('%(asctime)s')
+        first = make_record("message")
+        second = make_record("message")
+        first.created, first.msecs = 1700000000.1, 100.0
+        second.created, second.msecs = 1700000000.2, 200.0
+        
+        assert formatter.format(first) != formatter.format(second)
+
+
+class TestBufferedRotatingFileHandler:
+    """Unit tests for BufferedRotatingFileHandler."""
+    
+    def test_info_records_are_buffered_until_close(self, tmp_path):
+        """Test that records inside the flush interval stay buffered until close."""
+        log_file = tmp_path / 'buffered.log'
+        handler = BufferedRotatingFileHandler(str(log_file), flush_interval=3600)
+        
+        handler.handle(make_record("first"))
+        handler.handle(make_record("second"))
+        assert log_file.read_text() == ""
+        
+        handler.close()
+        assert log_file.read_text() == "first\nsecond\n"
+    
+    def test_error_records_are_flushed_immediately(self, tmp_path):
+        """Test that an error record flushes everything buffered before it."""
+        log_file = tmp_path / 'buffered.log'
+        handler = BufferedRotatingFileHandler(str(log_file), flush_interval=3600)
+        
+        handler.handle(make_record("working"))
+        handler.handle(logging.LogRecord('test', logging.ERROR, __file__, 1, "failed", None, None))
+        
+        assert log_file.read_text() == "working\nfailed\n"
+        handler.close()
+    
+    def test_buffered_records_are_flushed_by_timer(self, tmp_path):
+        """Test that a buffered record is flushed without waiting for another record."""
+        log_file = tmp_path / 'buffered.log'
+        handler = BufferedRotatingFileHandler(str(log_file), flush_interval=0.05)
+        
+        handler.handle(make_record("idle"))
+        deadline = time.monotonic() + 5
+        while log_file.read_text() == "" and time.monotonic() < deadline:
+            time.sleep(0.01)
+        
+        assert log_file.read_text() == "idle\n"
+        handler.close()
+        handler._flusher.join(timeout=5)
+        assert not handler._flusher.is_alive()
+    
+    def test_rollover_counts_buffered_bytes(self, tmp_path):
+        """Test that the size limit includes records still in the buffer."""
+        log_file = tmp_path / 'buffered.log'
+        handler = BufferedRotatingFileHandler(str(log_file), maxBytes=25, backupCount=1, flush_interval=3600)
+        
+        for text in ["message 1", "message 2", "message 3"]:
+            handler.handle(make_record(text))
+        handler.close()
+        
+        assert (tmp_path / 'buffered.log.1').read_text() == "message 1\nmessage 2\n"
+        assert log_file.read_text() == "message 3\n"
+
+
+class TestSetupLogger:
+    """Unit tests for setup_logger."""
+    
+    def test_records_are_written_sanitized_by_listener(self, tmp_path):
+        """Test that queued records reach the log file sanitized."""
+        log_file = tmp_path / 'logs' / 'test.log'
+        logger = setup_logger('test_setup_logger', log_file=str(log_file))
+        
+        logger.info("Logging in with password=%s", "hunter2")
+        logger.debug("Hidden at INFO level")
+        utils.logger._stop_listener('test_setup_logger')
+        
+        lines = log_file.read_text().splitlines()
+        assert len(lines) == 1
+        assert lines[0].endswith("INFO - test_setup_logger - Logging in with password=***REDACTED***")
+    
+    def test_setup_again_replaces_listener(self, tmp_path):
+        """Test that reconfiguring a logger leaves a single listener and handler."""
+        log_file = tmp_path / 'logs' / 'test.log'
+        setup_logger('test_setup_twice', log_file=str(log_file))
+        logger = setup_logger('test_setup_twice', log_file=str(log_file))
+        
+        logger.info("Only once")
+        utils.logger._stop_listener('test_setup_twice')
+        
+        assert len(logger.handlers) == 1
+        assert log_file.read_text().count("Only once") == 1
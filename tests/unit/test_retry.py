@@ -0,0 +1,96 @@
+"""Unit tests for retry utilities."""
+import pytest
+import utils.retry
+from utils.retry import retry_with_backoff
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record retry delays instead of sleeping."""
+    recorded = []
+    monkeypatch.setattr(utils.retry.time, 'sleep', recorded.append)
+    return recorded
+
+
+class TestRetryWithBackoff:
+    """Unit tests for retry_with_backoff."""
+    
+    def test_returns_after_transient_failures(self, sleeps):
+        """Test that the call succeeds once a failing function recovers."""
+        calls = []
+        
+        @retry_with_backoff(max_attempts=3, initial_delay=1.0, jitter=False)
+        def flaky():
+            calls.append(1)
+            if len(calls) < 3:
+                raise ConnectionError("temporary")
+            return "ok"
+        
+        assert flaky() == "ok"
+        assert len(calls) == 3
+        assert sleeps == [1.0, 2.0]
+    
+    def test_raises_after_last_attempt(self, sleeps):
+        """Test that the last failure is raised with exponential delays between attempts."""
+        @retry_with_backoff(max_attempts=4, initial_delay=0.5, backoff_factor=3.0, jitter=False)
+        def broken():
+            raise ConnectionError("always")
+        
+        with pytest.raises(ConnectionError):
+            broken()
+        
+        assert sleeps == [0.5, 1.5, 4.5]
+    
+    def test_other_exceptions_are_not_retried(self, sleeps):
+        """Test that exceptions outside the retry list propagate immediately."""
+        calls = []
+        
+        @retry_with_backoff(max_attempts=3, exceptions=(ConnectionError,))
+        def broken():
+            calls.append(1)
+            raise KeyError("bad")
+        
+        with pytest.raises(KeyError):
+            broken()
+        
+        assert len(calls) == 1
+        assert sleeps == []
+    
+    def test_non_retryable_exceptions_raise_immediately(self, sleeps):
+        """Test that programming errors are not retried by default."""
+        calls = []
+        
+        @retry_with_backoff(max_attempts=3)
+        def buggy():
+            calls.append(1)
+            raise TypeError("bad call")
+        
+        with pytest.raises(TypeError):
+            buggy()
+        
+        assert len(calls) == 1
+        assert sleeps == []
+    
+    def test_non_retryable_can_be_overridden(self, sleeps):
+        """Test that an empty non_retryable retries every listed exception."""
+        @retry_with_backoff(max_attempts=2, non_retryable=(), jitter=False)
+        def broken():
+            raise ValueError("always")
+        
+        with pytest.raises(ValueError):
+            broken()
+        
+        assert sleeps == [1.0]
+    
+    def test_jitter_waits_within_backoff_delay(self, sleeps):
+        """Test that jittered waits stay between zero and the backoff delay."""
+        @retry_with_backoff(max_attempts=4, initial_delay=1.0)
+        def broken():
+            raise ConnectionError("always")
+        
+        with pytest.raises(ConnectionError):
+            broken()
+        
+        assert len(sleeps) == 3
+        for delay, limit in zip(sleeps, [1.0, 2.0, 4.0]):
+            assert 0 <= delay <= limit
@@ -1,77 +1,277 @@
 """Logging configuration with credential sanitization."""
+import atexit
 import logging
 import os
+import queue
 import re
-from logging.handlers import RotatingFileHandler
-from typing import Any
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Any, Dict, Optional
+
+
+# Lowercase literals, one of which every CredentialSanitizer.PATTERN match contains
+_TRIGGER_WORDS = ('token', 'password', 'key', 'secret', 'bearer', 'xox')
+
+# Matches any text that CredentialSanitizer.PATTERN could redact. Case-insensitive
+# regex matching also folds some non-ASCII letters (such as the long s) onto
+# ASCII ones, which a lowercase substring check would miss.
+_TRIGGER = re.compile(r'token|password|api[_-]?key|secret|bearer|xox[baprs]-', re.IGNORECASE)
+
+
+def _has_trigger(text: str) -> bool:
+    """Check whether text may contain a credential that PATTERN would redact."""
+    # Plain substring searches are several times faster than the regex
+    if text.isascii():
+        lowered = text.lower()
+        return any(word in lowered for word in _TRIGGER_WORDS)
+    return _TRIGGER.search(text) is not None
+
+
+# Background listeners that write each configured logger's records, by logger name
+_listeners: Dict[str, QueueListener] = {}
 
 
 class CredentialSanitizer(logging.Filter):
     """Filter to sanitize credentials from log messages."""
     
-    # Patterns for common credential formats
-    PATTERNS = [
-        (re.compile(r'(token["\']?\s*[:=]\s*["\']?)([^"\'}\s]+)', re.IGNORECASE), r'\1***REDACTED***'),
-        (re.compile(r'(password["\']?\s*[:=]\s*["\']?)([^"\'}\s]+)', re.IGNORECASE), r'\1***REDACTED***'),
-        (re.compile(r'(api[_-]?key["\']?\s*[:=]\s*["\']?)([^"\'}\s]+)', re.IGNORECASE), r'\1***REDACTED***'),
-        (re.compile(r'(secret["\']?\s*[:=]\s*["\']?)([^"\'}\s]+)', re.IGNORECASE), r'\1***REDACTED***'),
-        (re.compile(r'(bearer\s+)([^\s]+)', re.IGNORECASE), r'\1***REDACTED***'),
-        (re.compile(r'(xox[baprs]-[^\s]+)', re.IGNORECASE), r'***REDACTED***'),  # Slack tokens
-    ]
+    # Common credential formats as one alternation, so a message is scanned
+    # once; the named groups hold the text kept in front of the redaction
+    PATTERN = re.compile(
+        r'(?P<key>(?:token|password|api[_-]?key|secret)["\']?\s*[:=]\s*["\']?)[^"\'}\s]+'
+        r'|(?P<bearer>bearer\s+)[^\s]+'
+        r'|xox[baprs]-[^\s]+',  # Slack tokens
+        re.IGNORECASE
+    )
+    
+    @staticmethod
+    def _redact(match: re.Match) -> str:
+        """Replace the secret part of a credential match."""
+        return (match.group('key') or match.group('bearer') or '') + '***REDACTED***'
     
     def filter(self, record: logging.LogRecord) -> bool:
         """Sanitize the log record message."""
-        if isinstance(record.msg, str):
-            for pattern, replacement in self.PATTERNS:
-                record.msg = pattern.sub(replacement, record.msg)
+        try:
+            message = record.getMessage()
+        except Exception:
+            # Malformed format string or arguments; the handler reports
+            # those, so sanitize the parts it will print
+            self._sanitize_parts(record)
+            return True
+        
+        # Sanitize the message as it will be rendered, so a credential split
+        # between the format string and its arguments is still caught.
+        # Most messages contain no credential markers and are left as they are.
+        if _has_trigger(message):
+            record.msg = self.PATTERN.sub(self._redact, message)
+            record.args = None
+        
+        return True
+    
+    def _sanitize_parts(self, record: logging.LogRecord) -> None:
+        """Sanitize the message and arguments of a record separately."""
+        if isinstance(record.msg, str) and _has_trigger(record.msg):
+            record.msg = self.PATTERN.sub(self._redact, record.msg)
         
         # Sanitize args if present
         if record.args:
-            sanitized_args = []
-            for arg in record.args if isinstance(record.args, tuple) else [record.args]:
-                if isinstance(arg, str):
-                    for pattern, replacement in self.PATTERNS:
-                        arg = pattern.sub(replacement, arg)
-                sanitized_args.append(arg)
-            record.args = tuple(sanitized_args) if isinstance(record.args, tuple) else sanitized_args[0]
+            # A single mapping argument is stored bare; handle it as a 1-tuple
+            is_tuple = isinstance(record.args, tuple)
+            args = record.args if is_tuple else (record.args,)
+            if any(isinstance(arg, str) and _has_trigger(arg) for arg in args):
+                sanitized_args = tuple(
+                    self.PATTERN.sub(self._redact, arg) if isinstance(arg, str) else arg
+                    for arg in args
+                )
+                record.args = sanitized_args if is_tuple else sanitized_args[0]
+
+
+class CachedTimeFormatter(logging.Formatter):
+    """
+    Formatter that renders each second's timestamp only once.
+    
+    With a datefmt of whole seconds, every record logged within the same
+    second shares a timestamp, so strftime runs at most once per second.
+    Without a datefmt the default format includes milliseconds and is
+    not cached.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        """Initialize the formatter with an empty timestamp cache."""
+        super().__init__(*args, **kwargs)
+        self._last_time = (None, '')
+    
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        """Format the record's creation time, reusing the last result within a second."""
+        if not datefmt:
+            return super().formatTime(record, datefmt)
         
-        return True
+        second = int(record.created)
+        cached_second, cached = self._last_time
+        if second == cached_second:
+            return cached
+        
+        formatted = super().formatTime(record, datefmt)
+        # Store both together so concurrent handlers never see a mismatched pair
+        self._last_time = (second, formatted)
+        return formatted
+
+
+class BufferedRotatingFileHandler(RotatingFileHandler):
+    """
+    Rotating file handler that buffers writes instead of flushing per record.
+    
+    Records are encoded and written to a large binary buffer. ERROR and
+    above flush it immediately. Otherwise a daemon timer thread flushes
+    pending records every flush_interval seconds, so they reach the file
+    even when no later record arrives. The buffer is also flushed when
+    the handler rolls over or is closed.
+    """
+    
+    def __init__(
+        self,
+        filename: str,
+        maxBytes: int = 0,
+        backupCount: int = 0,
+        buffer_size: int = 64 * 1024,
+        flush_interval: float = 1.0
+    ):
+        """
+        Initialize the handler.
+        
+        Args:
+            filename: Path of the log file
+            maxBytes: Size in bytes at which the file is rolled over, 0 to never roll over
+            backupCount: Number of rolled over files to keep
+            buffer_size: Size of the write buffer in bytes
+            flush_interval: Maximum seconds a buffered record waits to be flushed
+        """
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self._pending = False
+        self._closing = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        super().__init__(filename, maxBytes=maxBytes, backupCount=backupCount, encoding='utf-8')
+    
+    def _open(self):
+        """Open the log file for buffered binary appending."""
+        return open(self.baseFilename, 'ab', buffering=self.buffer_size)
+    
+    def _flush_periodically(self) -> None:
+        """Flush pending records every flush_interval seconds until closed."""
+        while not self._closing.wait(self.flush_interval):
+            with self.lock:
+                if self._pending:
+                    self.flush()
+                    self._pending = False
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        """Write a record to the buffer, rolling over and flushing as needed."""
+        try:
+            data = (self.format(record) + self.terminator).encode(self.encoding)
+            if self.stream is None:
+                self.stream = self._open()
+            
+            # The buffered stream's tell() includes unflushed bytes without
+            # flushing them, unlike the seek() in shouldRollover
+            if self.maxBytes > 0 and self.stream.tell() + len(data) >= self.maxBytes:
+                self.doRollover()
+            
+            self.stream.write(data)
+            
+            if record.levelno >= logging.ERROR:
+                self.flush()
+                self._pending = False
+            else:
+                self._pending = True
+                if self._flusher is None and not self._closing.is_set():
+                    self._flusher = threading.Thread(
+                        target=self._flush_periodically,
+                        name=f"log-flush-{os.path.basename(self.baseFilename)}",
+                        daemon=True
+                    )
+                    self._flusher.start()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+    
+    def close(self) -> None:
+        """Stop the flush timer, then flush and close the file."""
+        # Not joined: logging.shutdown() calls close() with the handler lock
+        # held, and the timer thread may be waiting for that lock. It sees
+        # the closed stream and exits on its own.
+        self._closing.set()
+        super().close()
+
+
+# The sanitizer keeps no per-record state, so all handlers share one instance
+_SANITIZER = CredentialSanitizer()
+
+
+def _stop_listener(name: str) -> None:
+    """Stop a logger's background listener, writing out queued records first."""
+    listener = _listeners.pop(name, None)
+    if listener is None:
+        return
+    
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+
+
+@atexit.register
+def _stop_all_listeners() -> None:
+    """Flush and stop every background listener at interpreter exit."""
+    for name in list(_listeners):
+        _stop_listener(name)
 
 
 def setup_logger(name: str, log_level: str = "INFO", log_file: str = "logs/digest_maker.log") -> logging.Logger:
-    """Set up logger with file and console handlers."""
+    """
+    Set up logger with file and console handlers.
+    
+    Logging calls only put records on a queue; a background listener
+    sanitizes them and does the console and file I/O.
+    """
     # Create logs directory if it doesn't exist
     os.makedirs(os.path.dirname(log_file), exist_ok=True)
     
     # Create logger
     logger = logging.getLogger(name)
-    logger.setLevel(getattr(logging, log_level.upper()))
+    level = getattr(logging, log_level.upper(), logging.INFO)
+    logger.setLevel(level)
     
-    # Clear existing handlers
+    # Clear existing handlers and stop the listener that served them
     logger.handlers.clear()
+    _stop_listener(name)
     
     # Create formatter
-    formatter = logging.Formatter(
+    formatter = CachedTimeFormatter(
         '%(asctime)s - %(levelname)s - %(name)s - %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
     )
     
     # Console handler
     console_handler = logging.StreamHandler()
-    console_handler.setLevel(getattr(logging, log_level.upper()))
+    console_handler.setLevel(level)
     console_handler.setFormatter(formatter)
-    console_handler.addFilter(CredentialSanitizer())
-    logger.addHandler(console_handler)
+    console_handler.addFilter(_SANITIZER)
     
-    # File handler with rotation
-    file_handler = RotatingFileHandler(
+    # File handler with rotation, buffered since it runs off the calling thread
+    file_handler = BufferedRotatingFileHandler(
         log_file,
         maxBytes=10*1024*1024,  # 10MB
         backupCount=5
     )
-    file_handler.setLevel(getattr(logging, log_level.upper()))
+    file_handler.setLevel(level)
     file_handler.setFormatter(formatter)
-    file_handler.addFilter(CredentialSanitizer())
-    logger.addHandler(file_handler)
+    file_handler.addFilter(_SANITIZER)
+    
+    # Hand records to a background thread that runs both handlers
+    log_queue = queue.Queue(-1)
+    logger.addHandler(QueueHandler(log_queue))
+    listener = QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+    listener.start()
+    _listeners[name] = listener
     
     return logger
@@ -1,4 +1,5 @@
 """Retry utilities with exponential backoff."""
+import random
 import time
 import logging
 from functools import wraps
@@ -9,7 +10,9 @@ def retry_with_backoff(
     max_attempts: int = 3,
     initial_delay: float = 1.0,
     backoff_factor: float = 2.0,
-    exceptions: Tuple[Type[Exception], ...] = (Exception,)
+    exceptions: Tuple[Type[Exception], ...] = (Exception,),
+    non_retryable: Tuple[Type[Exception], ...] = (TypeError, ValueError, AttributeError, KeyError),
+    jitter: bool = True
 ):
     """
     Decorator to retry a function with exponential backoff.
@@ -19,27 +22,36 @@ def retry_with_backoff(
         initial_delay: Initial delay in seconds
         backoff_factor: Multiplier for delay after each attempt
         exceptions: Tuple of exception types to catch and retry
+        non_retryable: Tuple of exception types raised immediately without
+            retrying, even if they are covered by exceptions. The defaults
+            are programming errors that would fail the same way every time.
+        jitter: Wait a random time between zero and the backoff delay
+            ("full jitter"), so concurrent callers do not retry in lockstep
     """
     def decorator(func: Callable) -> Callable:
+        # Look the logger up once per decorated function, not on every call
+        logger = logging.getLogger(func.__module__)
+        # The wait before each retry is fixed by the decorator arguments
+        delays = tuple(initial_delay * backoff_factor ** i for i in range(max_attempts - 1))
+        
         @wraps(func)
         def wrapper(*args, **kwargs) -> Any:
-            logger = logging.getLogger(func.__module__)
-            delay = initial_delay
-            
             for attempt in range(max_attempts):
                 try:
                     return func(*args, **kwargs)
+                except non_retryable:
+                    raise
                 except exceptions as e:
                     if attempt == max_attempts - 1:
-                        logger.error(f"{func.__name__} failed after {max_attempts} attempts: {e}")
+                        logger.error("%s failed after %d attempts: %s", func.__name__, max_attempts, e)
                         raise
                     
+                    delay = random.uniform(0, delays[attempt]) if jitter else delays[attempt]
                     logger.warning(
-                        f"{func.__name__} attempt {attempt + 1}/{max_attempts} failed: {e}. "
-                        f"Retrying in {delay}s..."
+                        "%s attempt %d/%d failed: %s. Retrying in %.2fs...",
+                        func.__name__, attempt + 1, max_attempts, e, delay
                     )
                     time.sleep(delay)
-                    delay *= backoff_factor
             
             return None
         